@@ -1,53 +1,68 @@
-import math
+from operator import attrgetter
 import pygame
 from pygame.math import Vector2, Vector3
 import numpy as np
-from lut import ROTATION_MATRIX
+from lut import ROTATION, ROTATION_MATRIX
+from species import DEFAULT_TABLE, Species
+
+
+def _parameter(name):
+    get = attrgetter(name)
+    return property(lambda self: get(self.species_rows[self.species]))
 
 
 class Actor:
+    """One member of the flock, updated and drawn on its own.
+
+    An actor holds only its kinematic state and the index of its species in
+    Actor.species_rows, the Species shared by the whole flock; length,
+    max_speed and the other parameters are read from there. use_species()
+    swaps in another species table.
+
+    """
+
+    __slots__ = ('position', 'velocity', 'acceleration', 'species')
+
+    species_rows = Species.rows(DEFAULT_TABLE)
 
     def __init__(self,
                  position: Vector2,
                  velocity: Vector2,
-                 length: float,
-                 width: float,
-                 color=(0, 0, 0),
-                 max_speed=200,
-                 max_acceleration=200):
+                 species=0):
         self.position = position
         self.velocity = velocity.normalize()
         self.acceleration = Vector2(0, 0)
-        self.length = length
-        self.width = width
-        self.color = color
-        self.body_pts = None
-        self.transformed_pts = None
-
-        self.max_speed = max_speed
-        self.max_speed_squared = self.max_speed**2
-        self.max_acceleration = max_acceleration  # lower = more "inertia"
-        self.max_acceleration_squared = self.max_acceleration**2
-        self.arrival_radius_sq = 200**2
-
-        self.detection_radius = 75
+        self.species = species
+
+    @classmethod
+    def use_species(cls, species_table):
+        """Make actors read their parameters from species_table."""
+        cls.species_rows = Species.rows(species_table)
+
+    length = _parameter('length')
+    width = _parameter('width')
+    color = _parameter('color')
+    max_speed = _parameter('max_speed')
+    max_speed_squared = _parameter('max_speed_squared')
+    max_acceleration = _parameter('max_acceleration')  # lower = more "inertia"
+    max_acceleration_squared = _parameter('max_acceleration_squared')
+    arrival_radius_sq = _parameter('arrival_radius_sq')
+    detection_radius = _parameter('detection_radius')
 
     def local_pts(self):
         """ Calculate all visualization points in the local coordinate system
         """
         # the body of the actor
-        self.body_pts = np.array([[self.length/2, 0],
-                                  [-self.length/2, -self.width/2],
-                                  [-self.length/4, 0],
-                                  [-self.length/2, self.width/2]])
-
-        return self.body_pts
+        return np.array([[self.length/2, 0],
+                         [-self.length/2, -self.width/2],
+                         [-self.length/4, 0],
+                         [-self.length/2, self.width/2]])
 
     def rotate(self, pts, vec: Vector2):
         #theta = math.atan2(vec.y, vec.x)
         #cos = math.cos(theta)
         #sin = math.sin(theta)
-        theta = int(math.atan2(vec.y, vec.x)*180/math.pi)
+        theta = ROTATION.index(vec.x, vec.y)
         #cos = COS[theta]
         #sin = SIN[theta]
         #return np.array([[cos, -sin], [sin, cos]]).dot(pts.T).T
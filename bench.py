@@ -0,0 +1,132 @@
+import argparse
+import csv
+import itertools
+import json
+import random
+import sys
+import time
+
+from main import INDEXES, RENDERERS, PiViz
+from timing import PhaseTimer
+
+# Headless benchmark of PiViz.run, e.g.
+#
+#   python bench.py --counts 100 300 1000 --indexes quadtree hash \
+#       --json results.json --baseline baseline.json
+#
+# Every case runs from the same random seed under SDL's dummy video driver.
+# With --baseline, cases whose frame time grew by more than --tolerance are
+# reported as regressions and the exit status is 1.
+
+PHASES = ("build", "update", "render", "upscale", "flip")
+KEY = ("engine", "n_actors", "index", "renderer")
+
+
+def run_case(viz, engine, n_actors, index, renderer, frames, seed):
+    """Time one PiViz.run call; return its results as a flat dict."""
+    random.seed(seed)
+    timer = PhaseTimer()
+    options = {} if engine == "actor" else {"renderer": renderer}
+    start = time.perf_counter()
+    viz.run(frames, n_actors, engine, index, timer=timer, **options)
+    wall = time.perf_counter() - start
+
+    frame_ms = 1000 * wall / max(timer.frames, 1)
+    result = {"engine": engine, "n_actors": n_actors, "index": index,
+              "renderer": renderer, "frames": timer.frames,
+              "frame_ms": frame_ms, "fps": 1000 / frame_ms}
+    per_frame = timer.per_frame_ms()
+    for phase in PHASES:
+        result[phase + "_ms"] = per_frame.get(phase, 0.0)
+    return result
+
+
+def cases(engines, counts, indexes, renderers):
+    """Every (engine, n_actors, index, renderer) combination to run."""
+    for engine in engines:
+        if engine == "actor":
+            # Actors always draw themselves with pygame.draw.circle.
+            for n, index in itertools.product(counts, indexes):
+                yield engine, n, index, "actor"
+        else:
+            for n, index, renderer in itertools.product(counts, indexes,
+                                                        renderers):
+                if index in INDEXES:
+                    yield engine, n, index, renderer
+
+
+def compare(results, baseline, tolerance):
+    """Results whose frame time exceeds the baseline's by over tolerance.
+
+    Returns (result, baseline frame_ms) pairs; cases missing from the
+    baseline are skipped.
+
+    """
+    before = {tuple(row[k] for k in KEY): row["frame_ms"] for row in baseline}
+    regressions = []
+    for row in results:
+        old = before.get(tuple(row[k] for k in KEY))
+        if old is not None and row["frame_ms"] > old * (1 + tolerance):
+            regressions.append((row, old))
+    return regressions
+
+
+def write_csv(path, results):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark PiViz.run headless.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--counts", type=int, nargs="+",
+                        default=[100, 300, 1000])
+    parser.add_argument("--engines", nargs="+", default=["flock"],
+                        choices=["flock", "actor"])
+    parser.add_argument("--indexes", nargs="+", default=list(INDEXES),
+                        choices=list(INDEXES) + ["incremental"])
+    parser.add_argument("--renderers", nargs="+", default=["circle", "blit"],
+                        choices=list(RENDERERS))
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the results as JSON here")
+    parser.add_argument("--csv", help="write the results as CSV here")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative frame time growth")
+    args = parser.parse_args(argv)
+
+    viz = PiViz(size=tuple(args.size), headless=True)
+    results = []
+    for case in cases(args.engines, args.counts, args.indexes,
+                      args.renderers):
+        result = run_case(viz, *case, args.frames, args.seed)
+        results.append(result)
+        print("{engine:>6} {n_actors:>6} {index:>11} {renderer:>9} "
+              "{frame_ms:8.2f} ms {fps:7.1f} fps  ".format(**result) +
+              " ".join("{}={:.2f}".format(p, result[p + "_ms"])
+                       for p in PHASES))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.csv and results:
+        write_csv(args.csv, results)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for row, old in regressions:
+            print("REGRESSION {} {} {} {}: {:.2f} ms, baseline {:.2f} ms"
+                  .format(*(row[k] for k in KEY), row["frame_ms"], old))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import time
+
+import numpy as np
+import pygame
+
+# How many frames "auto" times each upscaling method for after a rescale.
+TRIALS = 3
+
+
+class Canvas:
+    """An off-screen surface to draw on, upscaled to the display each frame.
+
+    scale sets the canvas resolution relative to the simulation world: 1
+    draws at the world's resolution, 0.5 at half of it. to_canvas() maps
+    world positions onto the canvas, and present() upscales the canvas to
+    fill the display once per frame. When the two are the same size the
+    canvas is the display itself and present() costs nothing.
+
+    method picks how to upscale: "nearest" uses pygame.transform.scale,
+    "smooth" pygame.transform.smoothscale, and "integer" writes each canvas
+    pixel into a k x k block of the display's pixel array, which needs the
+    display to be an exact multiple of the canvas. integer also needs 32-bit
+    pixels; on other displays it falls back to nearest. "auto" times nearest
+    and, where possible, integer over the first frames after each rescale
+    and keeps the faster.
+
+    """
+
+    def __init__(self, display, world=(1920, 1080), scale=1.0,
+                 method="auto"):
+        if method not in ("auto", "nearest", "smooth", "integer"):
+            raise ValueError("unknown upscaling method: {}".format(method))
+        self.display = display
+        self.world = world
+        self.method = method
+        self.rescale(scale)
+
+    def rescale(self, scale):
+        """Change the canvas resolution to scale times the world's."""
+        w, h = self.display.get_size()
+        size = (max(round(self.world[0] * scale), 1),
+                max(round(self.world[1] * scale), 1))
+        self.scale = scale
+        self.factor = np.array(size) / self.world
+        if size == (w, h):
+            self.surface = self.display
+        else:
+            self.surface = pygame.Surface(size, 0, self.display)
+        self.integer = (w // size[0], h // size[1])
+        if w % size[0] or h % size[1]:
+            self.integer = None
+            if self.method == "integer" and self.surface is not self.display:
+                raise ValueError("integer upscaling needs the display to be "
+                                 "a multiple of the canvas")
+        # The canvas shares the display's format, and _integer copies whole
+        # pixels through 32-bit views of both.
+        packed = self.display.get_bitsize() == 32
+        if self.method != "auto":
+            method = self.method
+            if method == "integer" and not packed:
+                method = "nearest"
+            self._upscale = getattr(self, "_" + method)
+            self._trials = []
+        else:
+            methods = [self._nearest]
+            if self.integer is not None and packed:
+                methods.append(self._integer)
+            self._trials = [(method, []) for method in methods]
+
+    def to_canvas(self, positions):
+        """Map world positions onto the canvas."""
+        if self.surface is self.display and (self.factor == 1).all():
+            return positions
+        return np.asarray(positions) * self.factor
+
+    def present(self, rects=None):
+        """Upscale the canvas onto the display.
+
+        rects, canvas areas that changed, limit the upscale to those areas
+        when the scale is a whole number. Returns the display areas to
+        update, or None when the whole display changed.
+
+        """
+        if self.surface is self.display:
+            return rects
+        if rects is not None and self.integer is not None:
+            kx, ky = self.integer
+            areas = []
+            for rect in rects:
+                area = pygame.Rect(rect.x * kx, rect.y * ky,
+                                   rect.w * kx, rect.h * ky)
+                pygame.transform.scale(self.surface.subsurface(rect),
+                                       area.size,
+                                       self.display.subsurface(area))
+                areas.append(area)
+            return areas
+        if self._trials:
+            self._time_trial()
+        else:
+            self._upscale()
+        return None
+
+    def _time_trial(self):
+        """Upscale with the least tried method; settle once all are timed."""
+        method, times = min(self._trials, key=lambda trial: len(trial[1]))
+        start = time.perf_counter()
+        method()
+        times.append(time.perf_counter() - start)
+        if all(len(trial[1]) >= TRIALS for trial in self._trials):
+            self._upscale = min(self._trials,
+                                key=lambda trial: min(trial[1]))[0]
+            self._trials = []
+
+    def _nearest(self):
+        pygame.transform.scale(self.surface, self.display.get_size(),
+                               self.display)
+
+    def _smooth(self):
+        pygame.transform.smoothscale(self.surface, self.display.get_size(),
+                                     self.display)
+
+    def _integer(self):
+        kx, ky = self.integer
+        source = pygame.surfarray.pixels2d(self.surface)
+        target = pygame.surfarray.pixels2d(self.display)
+        for i in range(kx):
+            for j in range(ky):
+                target[i::kx, j::ky] = source
+        # Both surfaces stay locked while the views exist.
+        del source, target
@@ -0,0 +1,15 @@
+import pygame
+import pytest
+
+from canvas import Canvas
+
+
+@pytest.mark.parametrize("depth", [16, 24, 32])
+@pytest.mark.parametrize("method", ["auto", "integer"])
+def test_integer_upscale_any_depth(depth, method):
+    display = pygame.Surface((80, 40), 0, depth)
+    canvas = Canvas(display, world=(80, 40), scale=0.5, method=method)
+    canvas.surface.fill((255, 0, 0))
+    for _ in range(10):
+        canvas.present()
+    assert display.get_at((79, 39))[:3] == (255, 0, 0)
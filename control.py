@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import queue
+import stat
+import threading
+
+
+class ControlServer:
+    """Stream frame metrics to, and take commands from, a UNIX socket.
+
+    An asyncio loop serves the socket at path on its own thread. Clients
+    read one JSON object per line as publish() is called, and may send
+    lines of the form {"set": name, "value": value}, or {"get": name} to
+    ask for a report, which queue up as (name, value) and ("get", name)
+    until the render thread collects them with commands(). Neither call
+    waits on the network: publish() hands its message to the loop and
+    returns, and a client that has fallen more than max_buffer bytes
+    behind misses messages rather than holding anything up.
+
+        socat - UNIX-CONNECT:/tmp/pi_viz.sock
+        {"set": "actors", "value": 500}
+        {"get": "stats"}
+
+    """
+
+    def __init__(self, path, max_buffer=1 << 16):
+        self.path = path
+        self.max_buffer = max_buffer
+        self.error = None
+        self._commands = queue.Queue()
+        self._clients = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self.error is not None:
+            self._thread.join()
+            raise self.error
+
+    def _run(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            _remove_socket(self.path)
+            server = loop.run_until_complete(
+                asyncio.start_unix_server(self._serve, path=self.path))
+        except OSError as error:
+            self.error = error
+            self._ready.set()
+            loop.close()
+            return
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+            _remove_socket(self.path)
+
+    async def _serve(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                    if "get" in message:
+                        self._commands.put(("get", message["get"]))
+                    else:
+                        self._commands.put((message["set"],
+                                            message.get("value")))
+                except (ValueError, KeyError, TypeError):
+                    self._send(writer, {"error": "expected {\"set\": name, "
+                                                 "\"value\": value} or "
+                                                 "{\"get\": name}"})
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled by close(); ending quietly keeps asyncio from
+            # reporting the cancellation as an error.
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _send(self, writer, message):
+        if writer.transport.get_write_buffer_size() <= self.max_buffer:
+            writer.write((json.dumps(message) + "\n").encode())
+
+    def _broadcast(self, message):
+        for writer in list(self._clients):
+            self._send(writer, message)
+
+    @property
+    def connected(self):
+        """Whether any client is connected to receive publish()."""
+        return bool(self._clients)
+
+    def publish(self, message):
+        """Send message, a JSON-able dict, to every client without waiting.
+
+        message must not be changed afterwards; it is encoded later on the
+        server's thread.
+
+        """
+        if self._clients:
+            self._loop.call_soon_threadsafe(self._broadcast, message)
+
+    def commands(self):
+        """The (name, value) commands received since the last call."""
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def close(self):
+        """Stop serving and remove the socket."""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _remove_socket(path):
+    """Remove a socket left behind at path by an earlier run."""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
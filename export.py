@@ -0,0 +1,185 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# The layout of the shared memory block, all little-endian:
+#
+#   HEADER                          at 0
+#   SLOT header of each slot        at HEADER_SIZE
+#   ACTOR records of each slot      at data_offset + slot * slot_bytes
+#
+# Slot frame % slots holds frame number frame; header frame is the newest
+# complete one, 0 before the first. Each slot is guarded by a seqlock: its
+# sequence is odd while the writer fills it, so a reader copies the slot,
+# and keeps the copy if sequence was even and unchanged across the copy.
+MAGIC = b'PIVIZFLK'
+VERSION = 1
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('slots', '<u4'),
+    ('capacity', '<u4'),
+    ('stride', '<u4'),
+    ('data_offset', '<u8'),
+    ('slot_bytes', '<u8'),
+    ('frame', '<u8'),
+    ('dtype', 'S8'),
+])
+SLOT = np.dtype([
+    ('sequence', '<u8'),
+    ('frame', '<u8'),
+    ('count', '<u4'),
+    ('reserved', '<u4'),
+])
+ACTOR = np.dtype([
+    ('position', '<f4', (2,)),
+    ('velocity', '<f4', (2,)),
+    ('color', 'u1', (4,)),
+])
+HEADER_SIZE = 64
+
+
+class SharedFlockWriter:
+    """Publish the flock every frame to a shared memory ring buffer.
+
+    Any local process can map the block by name, e.g. a native renderer,
+    and read the newest frame without copies through a socket. Each actor
+    is an ACTOR record of float32 position and velocity and RGBA color;
+    the header gives the record stride and coordinate dtype so readers can
+    check the layout. Up to capacity actors are published; any more are
+    left out.
+
+    """
+
+    def __init__(self, name, capacity, slots=3):
+        self.capacity = capacity
+        self.slots = slots
+        slot_bytes = _align(capacity * ACTOR.itemsize)
+        data_offset = _align(HEADER_SIZE + slots * SLOT.itemsize)
+        self._shm = SharedMemory(name, create=True,
+                                 size=data_offset + slots * slot_bytes)
+        self.name = self._shm.name
+        self._header, self._slot, self._data = _views(
+            self._shm, slots, capacity, data_offset, slot_bytes)
+        self._slot[:] = 0
+        self._header['magic'] = MAGIC
+        self._header['version'] = VERSION
+        self._header['slots'] = slots
+        self._header['capacity'] = capacity
+        self._header['stride'] = ACTOR.itemsize
+        self._header['data_offset'] = data_offset
+        self._header['slot_bytes'] = slot_bytes
+        self._header['frame'] = 0
+        self._header['dtype'] = b'<f4'
+        self.frame = 0
+
+    def publish(self, positions, velocities, colors):
+        """Write a frame; colors are (N, 3) RGB, or one color for all."""
+        self.frame += 1
+        k = self.frame % self.slots
+        n = min(len(positions), self.capacity)
+        data = self._data[k, :n]
+        self._slot['sequence'][k] += 1
+        data['position'] = positions[:n]
+        data['velocity'] = velocities[:n]
+        colors = np.asarray(colors)
+        data['color'][:, :3] = colors[:n] if colors.ndim == 2 else colors
+        data['color'][:, 3] = 255
+        self._slot['frame'][k] = self.frame
+        self._slot['count'][k] = n
+        self._slot['sequence'][k] += 1
+        self._header['frame'] = self.frame
+
+    def close(self):
+        """Unmap and remove the block; readers keep their mappings."""
+        del self._header, self._slot, self._data
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedFlockReader:
+    """Read frames from a block published by a SharedFlockWriter."""
+
+    def __init__(self, name):
+        self._shm = _attach(name)
+        header = np.ndarray((), dtype=HEADER, buffer=self._shm.buf)
+        if header['magic'] != MAGIC or header['version'] != VERSION:
+            self._shm.close()
+            raise ValueError("not a version {} flock export: {}".format(
+                VERSION, name))
+        self.slots = int(header['slots'])
+        self.capacity = int(header['capacity'])
+        self._header, self._slot, self._data = _views(
+            self._shm, self.slots, self.capacity, int(header['data_offset']),
+            int(header['slot_bytes']))
+
+    def read(self, retries=100):
+        """The newest frame as (frame, actors), or None before the first.
+
+        actors is a copy of the frame's ACTOR records. Returns None too if
+        the writer kept overwriting the slot for retries attempts.
+
+        """
+        for _ in range(retries):
+            frame = int(self._header['frame'])
+            if frame == 0:
+                return None
+            k = frame % self.slots
+            before = int(self._slot['sequence'][k])
+            if before % 2:
+                continue
+            count = int(self._slot['count'][k])
+            slot_frame = int(self._slot['frame'][k])
+            actors = self._data[k, :count].copy()
+            if int(self._slot['sequence'][k]) == before:
+                return slot_frame, actors
+        return None
+
+    def close(self):
+        del self._header, self._slot, self._data
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _align(size, to=64):
+    return -(-size // to) * to
+
+
+def _views(shm, slots, capacity, data_offset, slot_bytes):
+    """The header, slot headers and (slots, capacity) records of shm."""
+    header = np.ndarray((), dtype=HEADER, buffer=shm.buf)
+    slot = np.ndarray((slots,), dtype=SLOT, buffer=shm.buf,
+                      offset=HEADER_SIZE)
+    data = np.ndarray((slots, capacity), dtype=ACTOR, buffer=shm.buf,
+                      offset=data_offset,
+                      strides=(slot_bytes, ACTOR.itemsize))
+    return header, slot, data
+
+
+def _attach(name):
+    """Map an existing block without making this process its owner."""
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 the resource tracker would remove the block
+        # when this process exits, under the writer's feet. Unregistering
+        # afterwards is no good either: a child of the writer shares its
+        # tracker, and would drop the writer's registration.
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return SharedMemory(name)
+        finally:
+            resource_tracker.register = register
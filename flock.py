@@ -0,0 +1,620 @@
+import copy
+
+import numpy as np
+
+from periodic import PeriodicIndex
+from species import table as species_table
+from timing import NULL_TIMER
+
+# The per-actor arrays of a FlockState, which spawn() and despawn() keep in
+# step.
+COLUMNS = ('positions', 'velocities', 'accelerations', 'species')
+
+
+class FlockState:
+    """The kinematic state of a whole flock held in contiguous arrays.
+
+    positions, velocities and accelerations are (N, 2) float arrays, row i
+    belonging to actor i. step() advances every actor at once with the same
+    steering rules as Actor.update (cohesion, alignment, separation, speed
+    limiting and edge wrapping), using batched array operations instead of
+    one Python method call per actor.
+
+    All actors see the state at the start of the step; Actor.update instead
+    mutates actors in place while the loop runs, so later actors in the list
+    see the already-moved earlier ones. Apart from that ordering effect the
+    two produce the same motion.
+
+    index is the SpatialIndex class rebuilt every step with from_arrays to
+    find neighbors; without one neighbors are found by brute force. With
+    topological set, each actor only reacts to that many of its nearest
+    neighbors within detection_radius instead of to all of them, which
+    bounds the steering work per actor however dense the flock gets.
+
+    The per-species parameters live in table, a species.table() structured
+    array, and species holds each actor's row in it (all 0 by default).
+    Without a table, one is made from length, width, color, max_speed and
+    max_acceleration. Steering gathers every actor's parameters by species,
+    so a mixed flock costs no more than a uniform one.
+
+    With periodic set the world is a torus: actors wrap across the edges
+    as before, but they also see and steer by neighbors across them,
+    measured by the minimum-image displacement. The index is then wrapped
+    in a PeriodicIndex, which adds ghosts of the actors near the edges.
+
+    The population can change while the flock runs: spawn() adds actors
+    and despawn() removes them. The per-actor arrays are views of larger
+    preallocated storage that doubles whenever it fills, so spawning only
+    copies the new rows; capacity sets how many actors it has room for
+    from the start. Despawning moves the last live actors into the freed
+    rows, so the live actors stay contiguous.
+
+    """
+
+    def __init__(self,
+                 positions,
+                 velocities,
+                 length=20,
+                 width=20,
+                 color=(255, 255, 255),
+                 max_speed=200,
+                 max_acceleration=200,
+                 world=(1920, 1080),
+                 index=None,
+                 topological=None,
+                 species=None,
+                 table=None,
+                 periodic=False,
+                 capacity=None):
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        velocities = np.array(velocities, dtype=np.float64).reshape(-1, 2)
+        speed = np.hypot(velocities[:, 0], velocities[:, 1])[:, None]
+        self.velocities = np.divide(velocities, speed,
+                                    out=np.zeros_like(velocities),
+                                    where=speed > 0)
+        self.accelerations = np.zeros_like(self.positions)
+        # The arrays the per-actor ones are views of, once spawn() runs.
+        self._storage = None
+
+        if table is None:
+            table = species_table({'length': length, 'width': width,
+                                   'color': color, 'max_speed': max_speed,
+                                   'max_acceleration': max_acceleration})
+        self.table = table
+        if species is None:
+            self.species = np.zeros(len(self.positions), dtype=np.intp)
+        else:
+            self.species = np.asarray(species, dtype=np.intp)
+        if capacity is not None:
+            self._allocate(max(capacity, len(self.positions)))
+        self.world = world
+        self.index = index
+        self.topological = topological
+        self.periodic = periodic
+        # The index built for the current step, if step() is running.
+        self.tree = None
+        # The node count and depth of the last step's index, when timed.
+        self.index_stats = {}
+
+        self.avoid_radius_sq = 50**2
+
+        self.cohesion_weight = 50
+        self.alignment_weight = 50
+        self.separation_weight = 20
+
+    @classmethod
+    def random(cls, n, rng=None, **kwargs):
+        """Scatter n actors uniformly over the world with random headings.
+
+        With a table of several species and no species given, each actor
+        is given one at random.
+
+        """
+        rng = np.random.default_rng(rng)
+        w, h = kwargs.get('world', (1920, 1080))
+        positions = rng.uniform((0, 0), (w, h), size=(n, 2))
+        velocities = rng.uniform(-1, 1, size=(n, 2))
+        table = kwargs.get('table')
+        if table is not None and kwargs.get('species') is None:
+            kwargs['species'] = rng.integers(len(table), size=n)
+        return cls(positions, velocities, **kwargs)
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def length(self):
+        return self.table['length'].max()
+
+    @property
+    def width(self):
+        return self.table['width'].max()
+
+    @property
+    def detection_radius(self):
+        """The largest detection radius of any species."""
+        return self.table['detection_radius'].max()
+
+    @property
+    def color(self):
+        """The color of species 0."""
+        return tuple(self.table['color'][0].tolist())
+
+    @property
+    def period(self):
+        """The (width, height) of the torus, edge margins included."""
+        dim = 0.5 * max(self.length, self.width)
+        return (self.world[0] + 2*dim, self.world[1] + 2*dim)
+
+    @property
+    def origin(self):
+        """The top-left corner of the torus."""
+        dim = 0.5 * max(self.length, self.width)
+        return (-dim, -dim)
+
+    def parameter(self, name, rows=None):
+        """Species parameter name for each actor in rows, all by default.
+
+        A flock of one species gets a scalar instead of an array.
+
+        """
+        values = self.table[name]
+        if len(values) == 1:
+            return values[0]
+        return values[self.species if rows is None else self.species[rows]]
+
+    def wrap(self):
+        """Teleport actors that left the world to the opposite edge."""
+        if self.periodic:
+            origin, period = np.array(self.origin), np.array(self.period)
+            self.positions[:] = (self.positions - origin) % period + origin
+            return
+        dim = 0.5 * self.parameter('length')
+        dim = np.maximum(dim, 0.5 * self.parameter('width'))
+        for axis, extent in enumerate(self.world):
+            coord = self.positions[:, axis]
+            coord[:] = np.where(coord < -dim, extent + dim,
+                                np.where(coord > extent + dim, -dim, coord))
+
+    def neighbors(self, radius, rows=None, chunk=512):
+        """Find every actor within radius of each actor, itself included.
+
+        Returns (offsets, indices, d2) in compressed sparse row form: the
+        neighbors of the i-th actor asked about are
+        indices[offsets[i]:offsets[i+1]] and d2 holds the matching squared
+        distances. rows selects the actors asked about, all of them by
+        default. Without an index the distance matrix is built chunk rows
+        at a time to bound memory.
+
+        """
+        pos = self.positions
+        centres = pos if rows is None else pos[rows]
+        if self.index is not None:
+            tree = self.tree if self.tree is not None else self.build_index()
+            return tree.query_radius_many(centres, radius,
+                                          return_distances=True)
+
+        m = len(centres)
+        r2 = radius**2
+        indices, d2 = [], []
+        counts = np.zeros(m, dtype=np.intp)
+        for start in range(0, m, chunk):
+            delta = pos[None, :, :] - centres[start:start + chunk, None, :]
+            delta = self.displacement(delta)
+            dist = np.einsum('ijk,ijk->ij', delta, delta)
+            near, cols = np.nonzero(dist <= r2)
+            counts[start:start + chunk] = np.bincount(near,
+                                                      minlength=len(dist))
+            indices.append(cols)
+            d2.append(dist[near, cols])
+        offsets = np.zeros(m + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        if not indices:
+            return offsets, np.zeros(0, np.intp), np.zeros(0)
+        return offsets, np.concatenate(indices), np.concatenate(d2)
+
+    def build_index(self):
+        """Build the spatial index over the current positions."""
+        if self.index is None:
+            return None
+        pos = self.positions
+        if self.periodic:
+            return PeriodicIndex.from_arrays(
+                pos[:, 0], pos[:, 1], period=self.period, origin=self.origin,
+                margin=self.detection_radius, index=self.index)
+        return self.index.from_arrays(pos[:, 0], pos[:, 1])
+
+    def displacement(self, delta):
+        """Bring position differences to their minimum image if periodic."""
+        if not self.periodic:
+            return delta
+        period = np.array(self.period)
+        return delta - period * np.rint(delta / period)
+
+    def neighborhood(self, rows=None):
+        """The neighbor lists steer() uses for rows, all actors by default.
+
+        These are the neighbors() within each actor's own detection radius,
+        cut down to the topological nearest if that is set. The index then
+        searches for only that many with query_knn_many, rather than
+        listing every neighbor and sorting them.
+
+        """
+        radius = self.detection_radius
+        if self.topological is not None and self.index is not None:
+            # Each actor is its own nearest neighbor.
+            offsets, indices, d2 = self.nearest_neighbors(
+                self.topological + 1, radius, rows)
+        else:
+            offsets, indices, d2 = self.neighbors(radius, rows)
+        if (self.table['detection_radius'] < radius).any():
+            limit = self.parameter('detection_radius', rows)**2
+            offsets, indices, d2 = within(offsets, indices, d2, limit)
+        if self.topological is not None and self.index is None:
+            offsets, indices, d2 = nearest(offsets, indices, d2,
+                                           self.topological + 1)
+        return offsets, indices, d2
+
+    def nearest_neighbors(self, k, radius, rows=None):
+        """Find the k nearest actors within radius of each actor.
+
+        Returns (offsets, indices, d2) as neighbors() does, each row nearest
+        first; the index must be set.
+
+        """
+        centres = self.positions if rows is None else self.positions[rows]
+        tree = self.tree if self.tree is not None else self.build_index()
+        offsets, indices = tree.query_knn_many(centres, k, radius)
+        owner = np.repeat(np.arange(len(centres)), np.diff(offsets))
+        disp = self.displacement(self.positions[indices] - centres[owner])
+        return offsets, indices, _length_sq(disp)
+
+    def pairs(self, radius, chunk=512):
+        """Find every pair of actors within radius of each other once.
+
+        Returns (first, second, d2): the actor ids of each pair, with
+        first < second, and their squared distance. Without an index the
+        upper triangle of the distance matrix is built chunk rows at a time.
+
+        """
+        if self.index is not None:
+            tree = self.tree if self.tree is not None else self.build_index()
+            return tree.query_pairs(radius, return_distances=True)
+
+        pos = self.positions
+        r2 = radius**2
+        first, second = [np.zeros(0, np.intp)], [np.zeros(0, np.intp)]
+        d2 = [np.zeros(0)]
+        for start in range(0, len(pos), chunk):
+            delta = pos[None, start:, :] - pos[start:start + chunk, None, :]
+            delta = self.displacement(delta)
+            dist = np.einsum('ijk,ijk->ij', delta, delta)
+            near, cols = np.nonzero(dist <= r2)
+            above = cols > near
+            near, cols = near[above], cols[above]
+            first.append(near + start)
+            second.append(cols + start)
+            d2.append(dist[near, cols])
+        return (np.concatenate(first), np.concatenate(second),
+                np.concatenate(d2))
+
+    def steer(self, dt, offsets, indices, d2, rows=None):
+        """Accumulate the flocking forces into accelerations.
+
+        offsets, indices and d2 are the neighbor lists returned by
+        neighbors() for the same rows, which default to every actor.
+
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        m = len(rows)
+        pos = self.positions
+        counts = np.diff(offsets)
+        owner = np.repeat(np.arange(m), counts)
+        disp = self.displacement(pos[indices] - pos[rows][owner])
+
+        # avoid colliding: push away from everyone closer than 50 px
+        close = (d2 < self.avoid_radius_sq) & (d2 > 0)
+        push = _row_sum(owner[close], self._push(disp[close], d2[close]), m)
+
+        heading = _scale_to(self.velocities[indices], 1.0,
+                            _length_sq(self.velocities[indices]))
+        self._accelerate(dt, rows, counts, push, _row_sum(owner, disp, m),
+                         _row_sum(owner, heading, m))
+
+    def steer_pairs(self, dt, first, second, d2):
+        """Accumulate the flocking forces of every actor from pairs().
+
+        Gives the same forces as steer() over all actors, but each pair's
+        displacement and separation push are computed once and scattered
+        into both actors, with opposite signs where direction matters.
+
+        """
+        n = len(self)
+        pos, vel = self.positions, self.velocities
+        disp = self.displacement(pos[second] - pos[first])
+        heading = _scale_to(vel, 1.0, _length_sq(vel))
+        close = np.flatnonzero((d2 < self.avoid_radius_sq) & (d2 > 0))
+        pushes = self._push(disp[close], d2[close])
+
+        # Every actor is its own neighbor, at no displacement.
+        counts = np.ones(n, dtype=np.intp)
+        push = np.zeros((n, 2))
+        centroid = np.zeros((n, 2))
+        direction = heading.copy()
+        for actor, other, sign in ((first, second, 1), (second, first, -1)):
+            sees = self._sees(actor, d2)
+            counts += np.bincount(actor[sees], minlength=n)
+            centroid += sign * _row_sum(actor[sees], disp[sees], n)
+            direction += _row_sum(actor[sees], heading[other[sees]], n)
+            near = sees[close]
+            push += sign * _row_sum(actor[close[near]], pushes[near], n)
+        self._accelerate(dt, np.arange(n), counts, push, centroid, direction)
+
+    def _sees(self, actor, d2):
+        """Whether each actor is within detection radius of its pair."""
+        if (self.table['detection_radius'] < self.detection_radius).any():
+            return d2 <= self.parameter('detection_radius', actor)**2
+        return np.ones(len(d2), dtype=bool)
+
+    def _push(self, disp, d2):
+        """The separation force on actors from neighbors at disp."""
+        # scale_to_length(1000/|v|) for far pairs, 1000 for overlapping ones
+        scale = np.where(d2 > 1, 1000 / d2, 1000 / np.sqrt(d2))
+        return -self.separation_weight * disp * scale[:, None]
+
+    def _accelerate(self, dt, rows, counts, push, centroid, direction):
+        """Turn the neighbor sums of rows into accelerations.
+
+        counts, centroid and direction are the number of neighbors of each
+        actor, the sum of their displacements from it and the sum of their
+        headings; push is the summed separation force.
+
+        """
+        max_speed = self.parameter('max_speed', rows)
+        max_acceleration = self.parameter('max_acceleration', rows)
+        arrival_radius_sq = self.parameter('arrival_radius_sq', rows)
+        vel = self.velocities[rows]
+        acc = push * dt
+
+        # seek centroid
+        with np.errstate(invalid='ignore', divide='ignore'):
+            desired = centroid / counts[:, None]
+        dl2 = _length_sq(desired)
+        active = (counts > 0) & (dl2 >= 0.0001)
+        speed = np.where(dl2 > arrival_radius_sq, max_speed,
+                         max_speed * dl2 / arrival_radius_sq)
+        desired = _scale_to(desired, speed, dl2)
+        steer = desired - vel
+        steer = _clamp(steer, max_acceleration)
+        acc[active] += self.cohesion_weight * steer[active] * dt
+
+        # seek orientation
+        dir_l2 = _length_sq(direction)
+        active = dir_l2 > 0
+        steer = _scale_to(direction, max_speed, dir_l2) - vel
+        steer = _clamp(steer, max_acceleration)
+        acc[active] += self.alignment_weight * steer[active] * dt
+
+        self.accelerations[rows] += acc
+
+    def integrate(self, dt, rows=None):
+        """Apply accelerations to velocities, cap speed and move."""
+        max_speed = self.parameter('max_speed', rows)
+        rows = slice(None) if rows is None else rows
+        vel = self.velocities[rows]
+        delta = self.accelerations[rows] * dt
+        vel += delta
+        l2 = _length_sq(vel)
+        stopped = l2 == 0
+        vel[stopped] += delta[stopped]
+        too_fast = l2 > max_speed**2
+        max_speed = np.broadcast_to(max_speed, l2.shape)
+        vel[too_fast] = _scale_to(vel[too_fast], max_speed[too_fast],
+                                  l2[too_fast])
+        self.velocities[rows] = vel
+        self.positions[rows] += vel * dt
+
+    def spawn(self, positions, velocities, species=0):
+        """Add actors after the live ones and return their ids.
+
+        velocities only give the new actors' headings, as in __init__.
+
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 2)
+        n, k = len(self), len(positions)
+        self._reserve(n + k)
+        for name in COLUMNS:
+            setattr(self, name, self._storage[name][:n + k])
+        speed = np.hypot(velocities[:, 0], velocities[:, 1])[:, None]
+        self.positions[n:] = positions
+        self.velocities[n:] = np.divide(velocities, speed,
+                                        out=np.zeros_like(velocities),
+                                        where=speed > 0)
+        self.accelerations[n:] = 0
+        self.species[n:] = species
+        return np.arange(n, n + k)
+
+    def despawn(self, ids):
+        """Remove actors ids, filling their rows with the last live actors.
+
+        Returns (moved, to): the old and new ids of the actors that moved.
+
+        """
+        n = len(self)
+        ids = np.asarray(ids, dtype=np.intp).ravel()
+        if len(ids) and (ids.min() < 0 or ids.max() >= n):
+            raise ValueError("cannot despawn ids outside 0..{}".format(n - 1))
+        unique = np.unique(ids)
+        if len(unique) < len(ids):
+            raise ValueError("cannot despawn the same actor twice")
+        ids = unique
+        live = n - len(ids)
+        moved = np.setdiff1d(np.arange(live, n), ids, assume_unique=True)
+        to = ids[ids < live]
+        for name in COLUMNS:
+            column = getattr(self, name)
+            column[to] = column[moved]
+            setattr(self, name, column[:live])
+        return moved, to
+
+    def _reserve(self, n):
+        """Make the per-actor arrays views of storage with room for n."""
+        storage = self._storage
+        if (storage is not None and n <= len(storage['positions']) and
+                all(getattr(self, name).base is storage[name]
+                    for name in COLUMNS)):
+            return
+        capacity = max(n, 2 * len(self))
+        if storage is not None:
+            capacity = max(capacity, 2 * len(storage['positions']))
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Move the per-actor arrays into new storage for capacity."""
+        live = len(self)
+        self._storage = {}
+        for name in COLUMNS:
+            column = getattr(self, name)
+            self._storage[name] = np.empty((capacity,) + column.shape[1:],
+                                           dtype=column.dtype)
+            self._storage[name][:live] = column
+            setattr(self, name, self._storage[name][:live])
+
+    @property
+    def capacity(self):
+        """How many actors fit before spawn() has to grow the storage."""
+        if self._storage is None:
+            return len(self)
+        return len(self._storage['positions'])
+
+    def resize(self, n, rng=None):
+        """Drop actors from the end, or scatter new ones, to have n."""
+        if n <= len(self):
+            self.despawn(np.arange(n, len(self)))
+            return
+        new = FlockState.random(n - len(self), rng, world=self.world,
+                                table=self.table)
+        self.spawn(new.positions, new.velocities, new.species)
+
+    def take(self, ids):
+        """A FlockState with these parameters over copies of actors ids."""
+        sub = copy.copy(self)
+        sub._storage = None
+        sub.positions = self.positions[ids]
+        sub.velocities = self.velocities[ids]
+        sub.species = self.species[ids]
+        sub.accelerations = np.zeros_like(sub.positions)
+        return sub
+
+    def step(self, dt_ms, timer=NULL_TIMER, rows=None, stagger=1):
+        """Advance the whole flock by dt_ms milliseconds.
+
+        Only the actors in rows, all of them by default, steer; the rest
+        move on at their current velocity. When each actor is in rows only
+        every stagger-th step, its steering is scaled up to cover the steps
+        in between, so the flock moves as if all steered every step. timer,
+        a timing.PhaseTimer, is charged for the "build" of the spatial index
+        and the "update" of the actors, and given neighbor and index
+        counters if it is enabled.
+
+        When every actor steers and topological is unset, each neighbor
+        pair is visited once through pairs() and steer_pairs() rather than
+        once from either side.
+
+        """
+        dt = dt_ms / 1000.0
+        with timer.phase("build"):
+            self.accelerations[:] = 0
+            self.wrap()
+            tree = self.tree = self.build_index()
+        with timer.phase("update"):
+            try:
+                if rows is None and self.topological is None:
+                    first, second, d2 = self.pairs(self.detection_radius)
+                    self.steer_pairs(dt, first, second, d2)
+                    counts = 1 + np.bincount(np.concatenate((first, second)),
+                                             minlength=len(self))
+                else:
+                    offsets, indices, d2 = self.neighborhood(rows)
+                    self.steer(dt * stagger, offsets, indices, d2, rows)
+                    counts = np.diff(offsets)
+            finally:
+                self.tree = None
+            self.integrate(dt)
+        if timer.enabled:
+            self.index_stats = _index_stats(tree)
+            _count(timer, counts, self.index_stats)
+
+
+def nearest(offsets, indices, d2, k):
+    """Cut neighbor lists from neighbors() down to their k nearest entries."""
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    order = np.lexsort((d2, owner))
+    rank = np.arange(len(order)) - offsets[owner]
+    keep = order[rank < k]
+    new_offsets = np.zeros_like(offsets)
+    np.cumsum(np.minimum(counts, k), out=new_offsets[1:])
+    return new_offsets, indices[keep], d2[keep]
+
+
+def within(offsets, indices, d2, limit_sq):
+    """Cut neighbor lists down to the entries closer than their row's limit.
+
+    limit_sq holds a squared distance for each row of the lists.
+
+    """
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    keep = d2 <= np.asarray(limit_sq)[owner]
+    new_offsets = np.zeros_like(offsets)
+    np.cumsum(np.bincount(owner[keep], minlength=len(counts)),
+              out=new_offsets[1:])
+    return new_offsets, indices[keep], d2[keep]
+
+
+def _count(timer, counts, index_stats):
+    """Report neighbor and spatial index statistics to timer."""
+    if len(counts):
+        timer.count("neighbors/query", float(counts.mean()))
+        timer.count("max neighbors", int(counts.max()))
+    for name, value in index_stats.items():
+        timer.count(name, value)
+
+
+def _index_stats(tree):
+    """The node count and depth of tree, for the indexes that have them."""
+    tree = getattr(tree, "index", tree)
+    if not hasattr(tree, "node_count"):
+        return {}
+    return {"index nodes": tree.node_count, "index depth": tree.max_depth}
+
+
+def _length_sq(vectors):
+    return np.einsum('ij,ij->i', vectors, vectors)
+
+
+def _row_sum(rows, values, n):
+    """Sum the (M, 2) values into n rows according to the row of each."""
+    out = np.empty((n, 2))
+    out[:, 0] = np.bincount(rows, values[:, 0], minlength=n)
+    out[:, 1] = np.bincount(rows, values[:, 1], minlength=n)
+    return out
+
+
+def _scale_to(vectors, length, length_sq):
+    """Vector2.scale_to_length for many vectors; zero vectors stay zero."""
+    norm = np.sqrt(length_sq)
+    factor = np.divide(length, norm, out=np.zeros_like(norm), where=norm > 0)
+    return vectors * factor[:, None]
+
+
+def _clamp(vectors, limit):
+    """Shorten the vectors that are longer than limit."""
+    l2 = _length_sq(vectors)
+    over = l2 > limit**2
+    out = vectors.copy()
+    limit = np.broadcast_to(limit, l2.shape)
+    out[over] = _scale_to(vectors[over], limit[over], l2[over])
+    return out
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from flock import FlockState
+from quadtree import FlatQuadTree, QuadTree
+from spatial_hash import SpatialHash
+from species import table
+
+
+def clustered(n, seed=1):
+    """n points in five tight clumps, dense enough to crowd any cell."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(300, 1600, (5, 2))
+    return centres[rng.integers(5, size=n)] + rng.normal(0, 30, (n, 2))
+
+
+@pytest.mark.parametrize("index", [SpatialHash, FlatQuadTree])
+def test_knn_candidates_stay_bounded(index):
+    k = 8
+    for n in (1000, 4000):
+        pos = clustered(n)
+        tree = index.from_arrays(pos[:, 0], pos[:, 1])
+        offsets, indices = tree.query_knn_many(pos, k, 75)
+        assert (np.diff(offsets) == k).all()
+        assert tree.candidates <= 10 * k * n
+        # Listing every neighbor would measure far more.
+        assert len(tree.query_radius_many(pos, 75)[1]) > 5 * tree.candidates
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+@pytest.mark.parametrize("index", [SpatialHash, FlatQuadTree])
+def test_topological_neighborhood_matches_brute_force(index, periodic):
+    pos = np.vstack([clustered(800), np.random.default_rng(2).uniform(
+        (0, 0), (1920, 1080), (200, 2))])
+    vel = np.ones_like(pos)
+    brute = FlockState(pos, vel, topological=7, periodic=periodic)
+    state = FlockState(pos, vel, index=index, topological=7,
+                       periodic=periodic)
+    o0, _, d0 = brute.neighborhood()
+    offsets, _, d2 = state.neighborhood()
+    np.testing.assert_array_equal(offsets, o0)
+    for a, b in zip(np.split(d2, offsets[1:-1]), np.split(d0, o0[1:-1])):
+        np.testing.assert_allclose(a, np.sort(b))
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+@pytest.mark.parametrize("species", [False, True])
+@pytest.mark.parametrize("index", [None, SpatialHash, QuadTree])
+def test_steer_pairs_matches_steer(index, species, periodic):
+    rng = np.random.default_rng(3)
+    # Clumps straddling the corners, where periodic pairs wrap.
+    corners = rng.normal(0, 40, (200, 2)) % (1920, 1080)
+    pos = np.vstack([clustered(600), corners])
+    vel = rng.uniform(-1, 1, pos.shape)
+    kinds = {}
+    if species:
+        kinds = dict(table=table({}, {'detection_radius': 40}),
+                     species=rng.integers(2, size=len(pos)))
+    state = FlockState(pos, vel, index=index, periodic=periodic, **kinds)
+    state.steer(0.06, *state.neighborhood())
+    expected = state.accelerations.copy()
+    state.accelerations[:] = 0
+    state.steer_pairs(0.06, *state.pairs(state.detection_radius))
+    np.testing.assert_allclose(state.accelerations, expected, rtol=1e-9,
+                               atol=1e-9)
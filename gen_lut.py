@@ -1,5 +1,11 @@
+import sys
+
 import lut
 
-with open("rotation_matrix.py", 'w') as f:
-    for value in lut.ROTATION_MATRIX:
-        f.write(f"{value},")
\ No newline at end of file
+# Rebuild the cached rotation table: python gen_lut.py [resolution]
+if __name__ == "__main__":
+    resolution = int(sys.argv[1]) if len(sys.argv) > 1 else 360
+    table = lut.RotationLUT.build(resolution)
+    path = lut.cache_path(resolution)
+    table.save(path)
+    print("wrote {} rotations to {}".format(resolution, path))
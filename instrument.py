@@ -0,0 +1,98 @@
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from timing import PhaseTimer
+
+
+class Instrumentation(PhaseTimer):
+    """A PhaseTimer that also keeps what is needed to diagnose slow frames.
+
+    Besides the phase totals it keeps the durations of the last window
+    frames for percentiles, the time of each phase in the last frame, the
+    latest value of each counter, and, with trace set, a Chrome trace event
+    for every phase, which export_trace() writes out for chrome://tracing
+    or Perfetto.
+
+    """
+
+    def __init__(self, window=300, trace=False):
+        super().__init__()
+        self.frame_times = deque(maxlen=window)
+        self.last_frame = {}
+        self.counters = {}
+        self.trace = [] if trace else None
+        self._current = {}
+        self._origin = time.perf_counter()
+        self._frame_start = self._origin
+        self._font = None
+
+    def record(self, name, start, end):
+        super().record(name, start, end)
+        self._current[name] = self._current.get(name, 0.0) + end - start
+        if self.trace is not None:
+            self.trace.append({"name": name, "ph": "X", "pid": os.getpid(),
+                               "tid": 0, "ts": self._us(start),
+                               "dur": (end - start) * 1e6})
+
+    def count(self, name, value):
+        self.counters[name] = value
+        if self.trace is not None:
+            self.trace.append({"name": name, "ph": "C", "pid": os.getpid(),
+                               "ts": self._us(time.perf_counter()),
+                               "args": {"value": value}})
+
+    def end_frame(self):
+        super().end_frame()
+        now = time.perf_counter()
+        self.frame_times.append(now - self._frame_start)
+        self._frame_start = now
+        self.last_frame, self._current = self._current, {}
+
+    def _us(self, seconds):
+        return (seconds - self._origin) * 1e6
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """Frame time percentiles in milliseconds over the recent window."""
+        if not self.frame_times:
+            return {q: 0.0 for q in qs}
+        values = np.percentile(np.asarray(self.frame_times) * 1000, qs)
+        return dict(zip(qs, values.tolist()))
+
+    def summary_lines(self):
+        """The HUD text, one string per line."""
+        p = self.percentiles()
+        fps = 1000 / p[50] if p[50] else 0.0
+        lines = ["{:.1f} fps  p50 {:.1f}  p95 {:.1f}  p99 {:.1f} ms".format(
+            fps, p[50], p[95], p[99])]
+        lines.append("  ".join("{} {:.1f}".format(name, 1000 * seconds)
+                               for name, seconds in self.last_frame.items()))
+        lines.extend("{} {}".format(name, _format(value))
+                     for name, value in self.counters.items())
+        return lines
+
+    def draw_hud(self, surface, position=(8, 8), color=(0, 255, 0)):
+        """Draw the HUD onto surface and return the Rect it covers."""
+        if self._font is None:
+            self._font = pygame.font.Font(None, 24)
+        x, y = position
+        area = pygame.Rect(x, y, 0, 0)
+        for line in self.summary_lines():
+            text = self._font.render(line, True, color, (0, 0, 0))
+            area.union_ip(surface.blit(text, (x, y)))
+            y += text.get_height()
+        return area
+
+    def export_trace(self, path):
+        """Write the trace events recorded so far as Chrome trace JSON."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace or [],
+                       "displayTimeUnit": "ms"}, f)
+
+
+def _format(value):
+    return "{:.1f}".format(value) if isinstance(value, float) else str(value)
@@ -1,9 +1,85 @@
-import math
+import os
+
 import numpy as np
 
-SIN = [math.sin(i) for i in range(0, 360)]
-COS = [math.cos(i) for i in range(0, 360)]
+# Where RotationLUT.cached keeps its tables between runs.
+CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class RotationLUT:
+    """Rotation matrices for evenly spaced headings.
+
+    matrices is one contiguous (resolution, 2, 2) array; entry i rotates by
+    i * 360 / resolution degrees. Headings are mapped to the nearest entry,
+    so rotating a batch of points is a single gather plus an einsum.
+
+    """
+
+    def __init__(self, matrices):
+        self.matrices = matrices
+        self.resolution = len(matrices)
+
+    @classmethod
+    def build(cls, resolution=360):
+        theta = np.arange(resolution) * (2 * np.pi / resolution)
+        cos, sin = np.cos(theta), np.sin(theta)
+        matrices = np.empty((resolution, 2, 2))
+        matrices[:, 0, 0] = cos
+        matrices[:, 0, 1] = -sin
+        matrices[:, 1, 0] = sin
+        matrices[:, 1, 1] = cos
+        return cls(matrices)
+
+    @classmethod
+    def load(cls, path):
+        """Map a table saved with save() without reading it into memory."""
+        matrices = np.load(path, mmap_mode='r')
+        if matrices.ndim != 3 or matrices.shape[1:] != (2, 2):
+            raise ValueError("not a rotation table: {}".format(path))
+        return cls(matrices)
+
+    def save(self, path):
+        np.save(path, np.ascontiguousarray(self.matrices))
+
+    @classmethod
+    def cached(cls, resolution=360, cache_dir=CACHE_DIR):
+        """Load the table gen_lut.py saved, or build it if there is none.
+
+        Nothing is written; run gen_lut.py to fill the cache.
+
+        """
+        try:
+            lut = cls.load(cache_path(resolution, cache_dir))
+            if lut.resolution == resolution:
+                return lut
+        except (OSError, ValueError):
+            pass
+        return cls.build(resolution)
+
+    def index(self, vx, vy):
+        """Table indices of the headings of the vectors (vx, vy)."""
+        theta = np.arctan2(vy, vx) * (self.resolution / (2 * np.pi))
+        return np.rint(theta).astype(np.intp) % self.resolution
+
+    def rotate(self, pts, headings):
+        """Rotate pts, (K, 2) points in each actor's frame, by headings.
+
+        headings is an (N, 2) array of direction vectors; the result holds
+        the (N, K, 2) rotated points.
+
+        """
+        headings = np.asarray(headings)
+        rotations = self.matrices[self.index(headings[:, 0], headings[:, 1])]
+        return np.einsum('nij,kj->nki', rotations, pts)
+
+
+def cache_path(resolution, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, 'rotation_{}.npy'.format(resolution))
+
 
-ROTATION_MATRIX = [np.array([[math.cos(i*math.pi/180), -math.sin(i*math.pi/180)],
-                             [math.sin(i*math.pi/180), math.cos(i*math.pi/180)]]) for i in range(0, 360)]
+ROTATION = RotationLUT.cached(360)
+ROTATION_MATRIX = ROTATION.matrices
 
+# Indexed in whole degrees.
+SIN = ROTATION_MATRIX[:, 1, 0]
+COS = ROTATION_MATRIX[:, 0, 0]
@@ -0,0 +1,16 @@
+import numpy as np
+
+from lut import RotationLUT, cache_path
+
+
+def test_cached_builds_without_writing(tmp_path):
+    table = RotationLUT.cached(90, cache_dir=str(tmp_path))
+    assert table.resolution == 90
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cached_loads_saved_table(tmp_path):
+    RotationLUT.build(90).save(cache_path(90, str(tmp_path)))
+    table = RotationLUT.cached(90, cache_dir=str(tmp_path))
+    assert isinstance(table.matrices, np.memmap)
+    np.testing.assert_allclose(table.matrices, RotationLUT.build(90).matrices)
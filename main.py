@@ -2,23 +2,64 @@ import os
 import pygame
 from pygame.math import Vector2
 import time
-import timeit
 import random
 import numpy as np
 
 from actor import Actor
+from canvas import Canvas
+from control import ControlServer
+from export import SharedFlockWriter
+from flock import FlockState
+from instrument import Instrumentation
+from parallel import ParallelFlock
+from pipeline import PipelinedFlock
 from quadtree import Point, Rect, QuadTree
+from recording import Recorder, Recording
+from renderer import (BlitRenderer, CircleRenderer, DirtyRectRenderer,
+                      GlyphRenderer, SpeciesRenderer, SurfarrayRenderer)
+from scheduler import FrameScheduler
+from spatial_hash import SpatialHash
+from timestep import FixedTimestep
+from timing import NULL_TIMER
+
+# The spatial indexes PiViz.run can look neighbors up in.
+INDEXES = {
+    "quadtree": QuadTree,
+    "hash": SpatialHash,
+}
+
+# The ways PiViz.run can draw the flock engine's actors.
+RENDERERS = {
+    "circle": CircleRenderer,
+    "blit": BlitRenderer,
+    "surfarray": SurfarrayRenderer,
+    "glyph": GlyphRenderer,
+}
+
+# Keys that change the render scale of the flock engine while it runs, and
+# the step they change it by.
+SCALE_DOWN = (pygame.K_MINUS, pygame.K_KP_MINUS)
+SCALE_UP = (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS)
+SCALE_STEP = 0.25
 
 
 class PiViz:
     screen = None
 
-    def __init__(self):
-        "Ininitializes a new pygame screen using the framebuffer"
+    def __init__(self, size=None, headless=False):
+        """Ininitializes a new pygame screen using the framebuffer
+
+        size defaults to the framebuffer's. headless uses SDL's dummy video
+        driver instead, so nothing is shown and no framebuffer is needed.
+
+        """
 
         self.start_time = time.time()
 
-        os.putenv('SDL_FBDEV', '/dev/fb0')
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        else:
+            os.putenv('SDL_FBDEV', '/dev/fb0')
 
         # solves the ALSA lib error, apparently
         os.environ['SDL_AUDIODRIVER'] = 'dsp'
@@ -28,11 +69,13 @@ class PiViz:
         except pygame.error:
             print("failed to init pygame")
 
-        size = (pygame.display.Info().current_w,
-                pygame.display.Info().current_h)
+        if size is None:
+            size = (pygame.display.Info().current_w,
+                    pygame.display.Info().current_h)
         self.w, self.h = size[0], size[1]
         print("Framebuffer size: %d x %d" % (size[0], size[1]))
-        self.screen = pygame.display.set_mode(size, pygame.FULLSCREEN)
+        self.screen = pygame.display.set_mode(
+            size, 0 if headless else pygame.FULLSCREEN)
         # Clear the screen to start
         self.screen.fill((0, 0, 0))
         # Initialise font support
@@ -46,18 +89,56 @@ class PiViz:
     def __del__(self):
         "Destructor to make sure pygame shuts down, etc."
 
-    def run(self, frames, n_actors):
+    def run(self, frames, n_actors, engine="flock", index="quadtree", *,
+            timer=NULL_TIMER, hud=False, trace=None, **options):
+        """Animate n_actors for the given number of frames.
+
+        engine selects how the flock is simulated: "flock" advances a
+        FlockState in batched array operations (see run_flock for its
+        options), "actor" updates one Actor object at a time. index names
+        the spatial index from INDEXES that is rebuilt every frame to find
+        neighbors. The actor engine also accepts "incremental" to keep one
+        QuadTree and move its points. timer, a timing.PhaseTimer, is charged
+        for the "build", "update", "render" and "flip" phases of each frame.
+
+        hud draws frame time percentiles, phase times and counters on
+        screen, and trace names a file to write a Chrome trace of every
+        phase to when the run ends. Either one replaces a timer that is not
+        an Instrumentation with one; without them no instrumentation runs.
+
+        """
+        if (hud or trace) and not isinstance(timer, Instrumentation):
+            timer = Instrumentation(trace=trace is not None)
+        if trace and timer.trace is None:
+            timer.trace = []
+        try:
+            if engine == "flock":
+                return self.run_flock(frames, n_actors, index, timer=timer,
+                                      hud=hud, **options)
+            if engine != "actor":
+                raise ValueError("unknown engine: {}".format(engine))
+            return self.run_actors(frames, n_actors, index, timer=timer,
+                                   hud=hud)
+        finally:
+            if trace:
+                timer.export_trace(trace)
+
+    def run_actors(self, frames, n_actors, index="quadtree", *,
+                   timer=NULL_TIMER, hud=False):
+
         actors = []
         clock = pygame.time.Clock()
 
         for i in range(n_actors):
             actors.append(Actor(Vector2(random.uniform(0, 1920), random.uniform(0, 1080)),
-                                Vector2(random.uniform(-1,1), random.uniform(-1,1)),
-                                20, 
-                                20, 
-                                (255, 255, 255), 
-                                200, 
-                                200))
+                                Vector2(random.uniform(-1,1), random.uniform(-1,1))))
+
+        if index == "incremental":
+            tree = QuadTree(Rect(960, 540, 2*1920, 2*1080))
+            points = [Point(actor.position.x, actor.position.y, actor)
+                      for actor in actors]
+            for point in points:
+                tree.insert(point)
 
         running = True
         idx = 0
@@ -68,18 +149,348 @@ class PiViz:
                 if event.type == pygame.QUIT:
                     running = False
             dt = clock.tick()
-            w, h = 2*self.w, 2*self.h
-            tree = QuadTree(Rect(w/2, h/2, w, h))
-            for actor in actors:
-                tree.insert(Point(actor.position.x, actor.position.y, actor))
+            with timer.phase("build"):
+                if index == "incremental":
+                    for point in points:
+                        tree.move(point, point.payload.position.x,
+                                  point.payload.position.y)
+                else:
+                    tree = INDEXES[index].from_arrays(
+                        [actor.position.x for actor in actors],
+                        [actor.position.y for actor in actors],
+                        actors)
 
-            self.screen.fill((0, 0, 0))
-            for actor in actors:
-                actor.animate(self.screen, 60, tree)
+            with timer.phase("update"):
+                for actor in actors:
+                    actor.update(60, tree)
+            with timer.phase("render"):
+                self.screen.fill((0, 0, 0))
+                for actor in actors:
+                    actor.render(self.screen)
+                if hud:
+                    timer.draw_hud(self.screen)
 
-            pygame.display.flip()
+            with timer.phase("flip"):
+                pygame.display.flip()
+            timer.end_frame()
             idx += 1
 
+    def run_flock(self, frames, n_actors, index="quadtree", workers=1,
+                  pipelined=False, renderer="blit", dirty_rects=False,
+                  target_ms=None, topological=None, record=None, replay=None,
+                  species=None, periodic=False, render_scale=1.0,
+                  upscale="auto", fixed_step_ms=None, control=None,
+                  export=None, *, timer=NULL_TIMER, hud=False):
+        """Animate a FlockState of n_actors for the given number of frames.
+
+        With more than one worker the flock is simulated on that many
+        processes and the main process only renders; pipelined instead
+        simulates on a background thread one frame ahead of rendering.
+        renderer names the way from RENDERERS to draw with; dirty_rects
+        redraws and updates only the screen regions the actors touched,
+        falling back to a full flip when most of it did. target_ms sets a
+        frame time budget that a FrameScheduler keeps by steering only part
+        of the flock each frame.
+
+        Every frame normally advances the flock by one 60 ms step, so it
+        moves faster or slower as the frame rate changes. fixed_step_ms
+        instead runs steps of that length at the pace of real time, as
+        many per frame as have come due, and draws positions interpolated
+        between the last two (see timestep.FixedTimestep).
+
+        topological limits each actor to that many nearest neighbors.
+        species is a species.table() to give each actor a random one of,
+        every species drawn in its own color. periodic makes the world a
+        torus whose actors see each other across the screen edges.
+
+        record names an .npy file to stream every frame's positions and
+        velocities to (see recording.Recorder). replay names such a file to
+        draw instead of simulating; n_actors and the simulation options are
+        then ignored and the run ends with the recording.
+
+        The flock is drawn on a Canvas at render_scale times the resolution
+        of the simulated world and upscaled to the screen with the upscale
+        method; the - and + keys change the scale while it runs.
+
+        control names a UNIX socket to serve a control.ControlServer on.
+        Each frame's rate, phase times, actor count and neighbor counters
+        are streamed to it as a JSON line, and it takes commands that set
+        "actors", the "cohesion", "alignment" and "separation" weights, the
+        "renderer", the "index" or the "render_scale" between frames, or
+        that "spawn" or "despawn" that many actors, the latter at random.
+        Frame time percentiles and per-phase means over the recent frames
+        are only worked out when a client asks with {"get": "stats"}.
+
+        export names a shared memory block to publish every frame's
+        positions, velocities and colors to for other processes to draw
+        (see export.SharedFlockWriter). It has room for twice the starting
+        actor count; actors spawned beyond that are not exported.
+
+        """
+        if index not in INDEXES:
+            raise ValueError("unknown index for the flock engine: {}".format(
+                index))
+        if renderer not in RENDERERS:
+            raise ValueError("unknown renderer: {}".format(renderer))
+        if pipelined and workers > 1:
+            raise ValueError("pipelined mode runs a single worker thread")
+        if target_ms is not None and (pipelined or workers > 1):
+            raise ValueError("target_ms needs the single-threaded simulation")
+        if fixed_step_ms is not None and (pipelined or workers > 1 or
+                                          target_ms is not None or replay):
+            raise ValueError("fixed_step_ms needs the single-threaded "
+                             "simulation")
+        if record and replay:
+            raise ValueError("cannot record while replaying")
+        if replay:
+            replay = Recording(replay)
+            frames = min(frames, len(replay) - 1)
+            state = FlockState(*replay[0])
+            sim = pipeline = recorder = None
+        else:
+            seed = random.getrandbits(32)
+            # Leave room for actors spawned from the control socket.
+            state = FlockState.random(n_actors, seed, index=INDEXES[index],
+                                      topological=topological, table=species,
+                                      periodic=periodic,
+                                      capacity=2 * n_actors if control
+                                      else None)
+            sim = ParallelFlock(state, workers) if workers > 1 else None
+            pipeline = PipelinedFlock(state, 60) if pipelined else None
+            recorder = (Recorder(record, n_actors, seed=seed, dt_ms=60,
+                                 index=index, topological=topological,
+                                 periodic=periodic)
+                        if record else None)
+        if control and not isinstance(timer, Instrumentation):
+            timer = Instrumentation()
+        clock = pygame.time.Clock()
+        server = exporter = None
+        try:
+            server = ControlServer(control) if control else None
+            exporter = (SharedFlockWriter(export, 2 * len(state))
+                        if export else None)
+            canvas = Canvas(self.screen, state.world, render_scale, upscale)
+            draw = _wrap_renderer(RENDERERS[renderer](), state, dirty_rects)
+            scheduler = (FrameScheduler(target_ms) if target_ms is not None
+                         else None)
+            timestep = (FixedTimestep(fixed_step_ms)
+                        if fixed_step_ms is not None else None)
+            self._animate_flock(frames, state, sim, pipeline, draw, canvas,
+                                clock, timer, hud, scheduler, recorder,
+                                replay, timestep, server, exporter)
+        finally:
+            if exporter is not None:
+                exporter.close()
+            if server is not None:
+                server.close()
+            if recorder is not None:
+                recorder.close()
+            if sim is not None:
+                sim.close()
+            if pipeline is not None:
+                pipeline.close()
+
+    def _animate_flock(self, frames, state, sim, pipeline, renderer, canvas,
+                       clock, timer, hud, scheduler, recorder=None,
+                       replay=None, timestep=None, server=None,
+                       exporter=None):
+        hud_area = None
+        running = True
+        idx = 0
+        while running:
+            if idx > frames:
+                break
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if self._rescale(canvas, event.key):
+                        hud_area = None
+            if server is not None:
+                for name, value in server.commands():
+                    try:
+                        if name == "get":
+                            server.publish(_report(value, idx, state, timer))
+                            continue
+                        renderer = self._command(
+                            name, value, state, renderer, canvas, sim,
+                            pipeline,
+                            recorder is not None or replay is not None)
+                    except (ValueError, TypeError) as error:
+                        server.publish({"error": str(error)})
+                    if name == "render_scale":
+                        hud_area = None
+            dt = clock.tick()
+            if replay is not None:
+                positions, velocities = replay[idx]
+            elif pipeline is not None:
+                with timer.phase("update"):
+                    positions, velocities = pipeline.acquire()
+            elif sim is not None:
+                # The workers compute the next step while this one is drawn.
+                sim.start(60)
+                positions, velocities = state.positions, state.velocities
+            elif timestep is not None:
+                timer.count("steps", timestep.advance(state, dt, timer))
+                positions = timestep.positions(state)
+                velocities = state.velocities
+            elif scheduler is not None:
+                scheduler.end_frame(dt)
+                timer.count("stagger k", scheduler.k)
+                state.step(60, timer, scheduler.rows(len(state)),
+                           scheduler.k)
+                positions, velocities = state.positions, state.velocities
+            else:
+                state.step(60, timer)
+                positions, velocities = state.positions, state.velocities
+            if recorder is not None:
+                with timer.phase("record"):
+                    recorder.append(positions, velocities)
+            if exporter is not None:
+                with timer.phase("export"):
+                    exporter.publish(positions, velocities,
+                                     state.table['color'][state.species])
+
+            with timer.phase("render"):
+                surface = canvas.surface
+                points = canvas.to_canvas(positions)
+                if isinstance(renderer, DirtyRectRenderer):
+                    if hud and hud_area is not None:
+                        # Clear the previous HUD, which may have been wider,
+                        # before the actors are drawn over its area.
+                        surface.fill((0, 0, 0), hud_area)
+                    rects = renderer.draw(surface, points, state.color,
+                                          velocities)
+                    if rects is not None and hud and hud_area is not None:
+                        rects.append(hud_area)
+                else:
+                    surface.fill((0, 0, 0))
+                    renderer.draw(surface, points, state.color, velocities)
+                    rects = None
+                if hud:
+                    timer.count("render scale", canvas.scale)
+                    hud_area = timer.draw_hud(surface)
+                    if rects is not None:
+                        rects.append(hud_area)
+
+            with timer.phase("upscale"):
+                rects = canvas.present(rects)
+
+            with timer.phase("flip"):
+                if rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
+            if sim is not None:
+                with timer.phase("update"):
+                    sim.finish()
+            if pipeline is not None:
+                pipeline.release()
+            timer.end_frame()
+            if server is not None and server.connected:
+                server.publish(_metrics(idx, state, timer))
+            idx += 1
+
+    def _command(self, name, value, state, renderer, canvas, sim, pipeline,
+                 fixed_count):
+        """Apply a command from the control socket; return the renderer."""
+        dirty_rects = isinstance(renderer, DirtyRectRenderer)
+        if name in ("actors", "spawn", "despawn"):
+            if sim is not None or pipeline is not None or fixed_count:
+                raise ValueError("the actor count only changes in the "
+                                 "single-threaded simulation")
+            if name == "actors":
+                state.resize(int(value))
+            elif name == "spawn":
+                state.resize(len(state) + int(value))
+            else:
+                n = len(state)
+                state.despawn(np.random.default_rng().choice(
+                    n, min(int(value), n), replace=False))
+            base = renderer
+            while hasattr(base, "renderer"):
+                base = base.renderer
+            return _wrap_renderer(base, state, dirty_rects)
+        if name == "renderer":
+            return _wrap_renderer(RENDERERS[_choice(value, RENDERERS)](),
+                                  state, dirty_rects)
+        if name == "render_scale":
+            canvas.rescale(float(value))
+        elif name in ("cohesion", "alignment", "separation", "index"):
+            if sim is not None:
+                raise ValueError("{} is fixed while workers run".format(name))
+            if name == "index":
+                state.index = INDEXES[_choice(value, INDEXES)]
+            else:
+                setattr(state, name + "_weight", float(value))
+        else:
+            raise ValueError("unknown setting: {}".format(name))
+        return renderer
+
+    def _rescale(self, canvas, key):
+        """Step canvas's scale if key asks to; return whether it changed."""
+        if key in SCALE_DOWN:
+            scale = max(canvas.scale - SCALE_STEP, SCALE_STEP)
+        elif key in SCALE_UP:
+            largest = max(self.w / canvas.world[0], self.h / canvas.world[1])
+            scale = min(canvas.scale + SCALE_STEP, max(largest, 1.0))
+        else:
+            return False
+        if scale == canvas.scale:
+            return False
+        canvas.rescale(scale)
+        return True
+
+
+def _wrap_renderer(renderer, state, dirty_rects):
+    """Wrap renderer to draw state's species and, if asked, dirty rects."""
+    if len(state.table) > 1:
+        renderer = SpeciesRenderer(renderer, state.species,
+                                   state.table['color'])
+    if dirty_rects:
+        renderer = DirtyRectRenderer(renderer)
+    return renderer
+
+
+def _choice(value, choices):
+    if value not in choices:
+        raise ValueError("{!r} is not one of {}".format(
+            value, ", ".join(choices)))
+    return value
+
+
+def _metrics(frame, state, timer):
+    """The control socket's report on the frame timer just ended."""
+    frame_ms = 1000 * timer.frame_times[-1]
+    return {"frame": frame,
+            "fps": 1000 / frame_ms if frame_ms else 0.0,
+            "frame_ms": frame_ms,
+            "phases_ms": {name: 1000 * seconds
+                          for name, seconds in timer.last_frame.items()},
+            "actors": len(state),
+            "counters": _counters(state, timer)}
+
+
+def _report(name, frame, state, timer):
+    """The report a client asked for with {"get": name}."""
+    if name != "stats":
+        raise ValueError("unknown report: {}".format(name))
+    return {"stats": {"frame": frame,
+                      "percentiles_ms": {
+                          str(q): ms
+                          for q, ms in timer.percentiles().items()},
+                      "phase_means_ms": timer.per_frame_ms(),
+                      "actors": len(state),
+                      "counters": _counters(state, timer)}}
+
+
+def _counters(state, timer):
+    """timer's counters, with the index ones read from state's index."""
+    counters = {name: value for name, value in timer.counters.items()
+                if not name.startswith("index ")}
+    counters.update(state.index_stats)
+    return counters
+
 
 if __name__ == "__main__":
     viz = PiViz()
@@ -92,11 +503,4 @@ if __name__ == "__main__":
     profiler.disable()
     stats = pstats.Stats(profiler).sort_stats('tottime')
     stats.print_stats()
-    #viz.run(frames, 100)
-    #t = timeit.timeit(lambda: viz.run(frames, n_actors), number=1)
-    #print(f"{n_actors} actors for {frames} frames in {t}s, {frames/t} fps")
-
-    #for i in range(25):
-    #    t = timeit.timeit(lambda: viz.run(frames, n_actors+i*10), number=1)
-    #    #print(f"{n_actors} actors for {frames} frames in {t}s, {frames/t} fps")
-    #    print(f"{n_actors+i*10},{1000/t}")
+    # Frame rate sweeps: see bench.py
@@ -0,0 +1,193 @@
+import argparse
+import queue
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+import pygame
+
+from flock import FlockState
+from main import INDEXES, RENDERERS
+
+# Render a flock to a video file instead of the screen, e.g.
+#
+#   python offline.py --size 3840 2160 --actors 5000 --y4m flock.y4m
+#   ffmpeg -i flock.y4m flock.mp4
+#
+# Nothing is displayed, so any resolution works and no framebuffer is
+# needed. Frames are drawn into an off-screen Surface and handed to a writer
+# thread through a bounded queue, so at most a few frames are ever in memory.
+
+
+class Y4MWriter:
+    """Write RGB frames to a YUV4MPEG2 file in 4:2:0 (JPEG range).
+
+    rate is the frame rate as a (numerator, denominator) pair. Both sides of
+    size must be even.
+
+    """
+
+    def __init__(self, path, size, rate=(1000, 60)):
+        w, h = size
+        if w % 2 or h % 2:
+            raise ValueError("Y4M frames need an even size, got {}".format(
+                size))
+        self.size = size
+        self._file = open(path, 'wb')
+        self._file.write('YUV4MPEG2 W{} H{} F{}:{} Ip A1:1 C420jpeg\n'.format(
+            w, h, *rate).encode('ascii'))
+
+    def write(self, rgb):
+        """Write one frame given as RGB bytes from pygame.image.tobytes."""
+        w, h = self.size
+        rgb = np.frombuffer(rgb, dtype=np.uint8).reshape(h, w, 3)
+        r, g, b = (rgb[..., c].astype(np.float32) for c in range(3))
+        y = 0.299*r + 0.587*g + 0.114*b
+        # Chroma of each 2x2 block from its mean color.
+        r, g, b = (_halve(c) for c in (r, g, b))
+        u = 128 - 0.168736*r - 0.331264*g + 0.5*b
+        v = 128 + 0.5*r - 0.418688*g - 0.081312*b
+        self._file.write(b'FRAME\n')
+        for plane in (y, u, v):
+            self._file.write(np.clip(np.rint(plane), 0, 255)
+                             .astype(np.uint8).tobytes())
+
+    def close(self):
+        self._file.close()
+
+
+class PNGWriter:
+    """Write each frame to its own PNG file.
+
+    pattern is formatted with the frame number, e.g. "frames/{:05d}.png".
+
+    """
+
+    def __init__(self, pattern, size):
+        self.pattern = pattern
+        self.size = size
+        self.frames = 0
+
+    def write(self, rgb):
+        frame = pygame.image.frombuffer(rgb, self.size, 'RGB')
+        pygame.image.save(frame, self.pattern.format(self.frames))
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+class BackgroundWriter:
+    """Run a frame writer on its own thread behind a bounded queue.
+
+    put() blocks while depth frames are already waiting, which caps the
+    memory held by frames in flight and makes rendering wait for the disk
+    rather than run ahead of it.
+
+    """
+
+    def __init__(self, writer, depth=3):
+        self.writer = writer
+        self._queue = queue.Queue(maxsize=depth)
+        self.error = None
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def _write(self):
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                self.writer.write(frame)
+        except Exception as error:
+            self.error = error
+            # Keep draining so put() and close() never block for good.
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self.writer.close()
+
+    def put(self, frame):
+        """Queue a frame for writing, waiting while the queue is full."""
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+        self._queue.put(frame)
+
+    def close(self):
+        """Write the frames still queued and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def render(writer, frames, n_actors, size=(3840, 2160), index="quadtree",
+           renderer="blit", seed=None, depth=3):
+    """Simulate n_actors over size and hand each drawn frame to writer.
+
+    Returns the number of frames, the frames per second achieved and the
+    peak resident memory in megabytes.
+
+    """
+    state = FlockState.random(n_actors, seed, world=size,
+                              index=INDEXES[index])
+    surface = pygame.Surface(size, 0, 32)
+    draw = RENDERERS[renderer]()
+    start = time.perf_counter()
+    with BackgroundWriter(writer, depth) as background:
+        for _ in range(frames):
+            state.step(60)
+            surface.fill((0, 0, 0))
+            draw.draw(surface, state.positions, state.color, state.velocities)
+            background.put(pygame.image.tobytes(surface, 'RGB'))
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"frames": frames, "fps": frames / elapsed, "peak_mb": peak}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a flock to Y4M or PNG files without a display.")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--actors", type=int, default=1000)
+    parser.add_argument("--size", type=int, nargs=2, default=[3840, 2160])
+    parser.add_argument("--index", default="quadtree", choices=list(INDEXES))
+    parser.add_argument("--renderer", default="blit", choices=list(RENDERERS))
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--queue", type=int, default=3,
+                        help="frames that may wait for the writer")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--y4m", help="write a Y4M video here")
+    output.add_argument("--png", help="PNG path pattern, e.g. out/{:05d}.png")
+    args = parser.parse_args(argv)
+
+    size = tuple(args.size)
+    if args.y4m:
+        writer = Y4MWriter(args.y4m, size)
+    else:
+        writer = PNGWriter(args.png, size)
+    stats = render(writer, args.frames, args.actors, size, args.index,
+                   args.renderer, args.seed, args.queue)
+    print("{frames} frames at {fps:.1f} fps, peak memory {peak_mb:.0f} MB"
+          .format(**stats))
+    return 0
+
+
+def _halve(plane):
+    """Average each 2x2 block of an (H, W) plane."""
+    h, w = plane.shape
+    return plane.reshape(h // 2, 2, w // 2, 2).mean(axis=(1, 3))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import multiprocessing as mp
+import os
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+# Slots of the control array shared with the workers.
+DT_MS, FRONT, STOP = range(3)
+
+
+class ParallelFlock:
+    """Advance a FlockState on several worker processes.
+
+    The world is cut into vertical tiles, one per worker. Positions and
+    velocities live in shared memory twice over: every step the workers
+    read the front buffer and write the actors they own into the back one,
+    then the buffers swap. A worker owns the actors whose wrapped position
+    falls in its tile and reads, but never writes, the halo of actors
+    within detection_radius of its borders. Ownership is recomputed from
+    the positions every step, so an actor crossing a border migrates to the
+    neighbouring worker on the next step.
+
+    While the workers run, state.positions and state.velocities are views
+    of the front buffer, so the main process can render them between
+    start() and finish().
+
+    """
+
+    def __init__(self, state, workers=None):
+        self.state = state
+        self.workers = workers or os.cpu_count()
+        n = len(state)
+        self._shm = SharedMemory(create=True, size=max(2 * 2 * n * 2 * 8, 1))
+        self._buffers = np.ndarray((2, 2, n, 2), dtype=np.float64,
+                                   buffer=self._shm.buf)
+        self._buffers[0, 0] = state.positions
+        self._buffers[0, 1] = state.velocities
+        self._front = 0
+        self._running = False
+
+        self._control = mp.Array('d', 3, lock=False)
+        self._barrier = mp.Barrier(self.workers + 1)
+        dim = max(0.5*state.width, 0.5*state.length)
+        edges = np.linspace(-dim, state.world[0] + dim, self.workers + 1)
+        if not state.periodic:
+            edges[0], edges[-1] = -np.inf, np.inf
+        self._processes = [
+            mp.Process(target=_worker,
+                       args=(edges[k], edges[k + 1], state, self._shm.name,
+                             n, self._barrier, self._control),
+                       daemon=True)
+            for k in range(self.workers)]
+        for process in self._processes:
+            process.start()
+        self._publish()
+
+    def _publish(self):
+        self.state.positions = self._buffers[self._front, 0]
+        self.state.velocities = self._buffers[self._front, 1]
+
+    def start(self, dt_ms):
+        """Let the workers compute the next step into the back buffer."""
+        self._control[DT_MS] = dt_ms
+        self._control[FRONT] = self._front
+        self._barrier.wait()
+        self._running = True
+
+    def finish(self):
+        """Wait for the step started by start() and swap the buffers."""
+        if not self._running:
+            return
+        self._barrier.wait()
+        self._running = False
+        self._front = 1 - self._front
+        self._publish()
+
+    def step(self, dt_ms):
+        """Advance the whole flock by dt_ms milliseconds."""
+        self.start(dt_ms)
+        self.finish()
+
+    def close(self):
+        """Stop the workers and hand the state back as private arrays."""
+        if self._processes:
+            try:
+                self.finish()
+                self._control[STOP] = 1
+                self._barrier.wait()
+            except BrokenBarrierError:
+                pass
+            for process in self._processes:
+                process.join()
+            self._processes = []
+        self.state.positions = self.state.positions.copy()
+        self.state.velocities = self.state.velocities.copy()
+        self.state.accelerations = np.zeros_like(self.state.positions)
+        del self._buffers
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _worker(west, east, state, shm_name, n, barrier, control):
+    """Advance the actors in the tile [west, east) until told to stop."""
+    shm = SharedMemory(shm_name)
+    buffers = np.ndarray((2, 2, n, 2), dtype=np.float64, buffer=shm.buf)
+    radius = state.detection_radius
+    try:
+        while True:
+            barrier.wait()
+            if control[STOP]:
+                break
+            front = int(control[FRONT])
+            dt = control[DT_MS] / 1000.0
+
+            # Every worker wraps its own copy the same way, so all of them
+            # agree on who owns which actor.
+            state.positions = buffers[front, 0].copy()
+            state.velocities = buffers[front, 1].copy()
+            state.wrap()
+            x = state.positions[:, 0]
+            inside = (west <= x) & (x < east)
+            if state.periodic:
+                # The halo reaches around the torus from the end tiles.
+                span = state.period[0]
+                near = (((west - x) % span <= radius) |
+                        ((x - east) % span < radius))
+            else:
+                near = (((west - radius <= x) & (x < west)) |
+                        ((east <= x) & (x < east + radius)))
+            owned = np.flatnonzero(inside)
+            halo = np.flatnonzero(near & ~inside)
+
+            local = state.take(np.concatenate((owned, halo)))
+            rows = np.arange(len(owned))
+            local.steer(dt, *local.neighborhood(rows), rows=rows)
+            local.integrate(dt, rows)
+            buffers[1 - front, 0, owned] = local.positions[rows]
+            buffers[1 - front, 1, owned] = local.velocities[rows]
+            barrier.wait()
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del buffers
+        shm.close()
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from flock import FlockState
+from parallel import ParallelFlock
+from quadtree import QuadTree
+from spatial_hash import SpatialHash
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+@pytest.mark.parametrize("index", [None, SpatialHash, QuadTree])
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_matches_serial(workers, index, periodic):
+    serial = FlockState.random(400, 5, index=index, periodic=periodic)
+    state = FlockState.random(400, 5, index=index, periodic=periodic)
+    with ParallelFlock(state, workers) as parallel:
+        for _ in range(20):
+            serial.step(60)
+            parallel.step(60)
+            # Actors migrate between tiles and halos as they go.
+            np.testing.assert_allclose(state.positions, serial.positions,
+                                       rtol=0, atol=1e-8)
+    np.testing.assert_allclose(state.velocities, serial.velocities,
+                               rtol=0, atol=1e-8)
@@ -0,0 +1,177 @@
+import math
+
+import numpy as np
+
+from quadtree import Point
+from spatial_hash import SpatialHash
+from spatial_index import SpatialIndex, nearest_lists, pair_lists
+
+
+class PeriodicIndex(SpatialIndex):
+    """Another spatial index wrapped onto a torus.
+
+    The points live in the box [origin, origin + period), whose opposite
+    edges are joined. Every point within margin of an edge also gets a
+    ghost entry shifted one period across that edge (three for a point near
+    a corner), so a query reaching over an edge finds the ghost and
+    measures the distance to it: the minimum-image distance. Only the
+    border band is duplicated, and results always name the real point.
+
+    margin must cover the largest radius queried and stay under half the
+    period; points further away than margin are measured without wrapping.
+    Points added with insert() get their ghosts too.
+
+    """
+
+    def __init__(self, index, ids, n, payloads, period, origin, margin=75):
+        self.index = index
+        # The real point behind each entry of index, and which entries are
+        # the real ones rather than ghosts; at first, the first n.
+        self.ids = ids
+        self.real = np.arange(len(ids)) < n
+        self.n = n
+        self.payloads = payloads
+        self.period = period
+        self.origin = origin
+        self.margin = margin
+
+    @classmethod
+    def from_arrays(cls, xs, ys, payloads=None, period=(1920, 1080),
+                    origin=(0, 0), margin=75, index=SpatialHash):
+        """Build index over (xs, ys) plus ghosts of their border band."""
+        (w, h), (x0, y0) = period, origin
+        xs = (np.asarray(xs, dtype=np.float64) - x0) % w + x0
+        ys = (np.asarray(ys, dtype=np.float64) - y0) % h + y0
+        all_xs, all_ys = [xs], [ys]
+        ids = [np.arange(len(xs))]
+        for dx, dy, ghosts in _ghosts(xs, ys, period, origin, margin):
+            all_xs.append(xs[ghosts] + dx)
+            all_ys.append(ys[ghosts] + dy)
+            ids.append(ghosts)
+        return cls(index.from_arrays(np.concatenate(all_xs),
+                                     np.concatenate(all_ys)),
+                   np.concatenate(ids), len(xs), payloads, period, origin,
+                   margin)
+
+    def insert(self, point):
+        """Add Point point, and ghosts of it if it lies near an edge."""
+        x, y = self._wrap(point.x, point.y)
+        shifts = [(0, 0)] + [
+            (dx, dy) for dx, dy, ghosts in _ghosts(
+                np.array([x]), np.array([y]), self.period, self.origin,
+                self.margin) if len(ghosts)]
+        entry = len(self.ids)
+        if not self.index.insert(Point(x, y, entry)):
+            return False
+        for i, (dx, dy) in enumerate(shifts[1:], 1):
+            self.index.insert(Point(x + dx, y + dy, entry + i))
+        if self.payloads is None and point.payload is not None:
+            self.payloads = list(range(self.n))
+        if self.payloads is not None:
+            self.payloads = list(self.payloads) + [point.payload]
+        self.ids = np.append(self.ids, [self.n] * len(shifts))
+        self.real = np.append(self.real, [True] + [False] * (len(shifts) - 1))
+        self.n += 1
+        return True
+
+    def __len__(self):
+        return self.n
+
+    def _payload(self, i):
+        i = self.ids[i]
+        return int(i) if self.payloads is None else self.payloads[i]
+
+    def _wrap(self, x, y):
+        (w, h), (x0, y0) = self.period, self.origin
+        return (x - x0) % w + x0, (y - y0) % h + y0
+
+    def query(self, boundary, found_points):
+        """Find the points, real or ghost, that lie within boundary."""
+        for point in self.index.query(boundary, []):
+            found_points.append(Point(point.x, point.y,
+                                      self._payload(point.payload)))
+        return found_points
+
+    def query_radius(self, centre, radius, found_payloads):
+        found_payloads.extend(
+            self._payload(i)
+            for i in self.index.query_radius(self._wrap(*centre), radius, []))
+        return found_payloads
+
+    def query_knn(self, centre, k, max_radius=math.inf):
+        # Beyond margin a point and its ghosts can all be near enough; each
+        # point has at most four entries, so 4k of them hold k points.
+        found = []
+        seen = set()
+        for i in self.index.query_knn(self._wrap(*centre), 4 * k,
+                                      max_radius):
+            if self.ids[i] not in seen:
+                seen.add(self.ids[i])
+                found.append(self._payload(i))
+        return found[:k]
+
+    def query_knn_many(self, centres, k, max_radius=math.inf):
+        # A point and its ghosts are a period apart, so within max_radius
+        # under half the period at most one of them is found; otherwise
+        # 4k entries are asked for, as in query_knn, and deduplicated.
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        x, y = self._wrap(centres[:, 0], centres[:, 1])
+        unique = 2 * max_radius < min(self.period)
+        offsets, indices = self.index.query_knn_many(
+            np.column_stack((x, y)), k if unique else 4 * k, max_radius)
+        ids = self.ids[indices]
+        if unique:
+            return offsets, ids
+        rows = np.repeat(np.arange(len(centres)), np.diff(offsets))
+        # np.unique keeps the first, so nearest, entry of every point; the
+        # entries' order then stands in for their distance.
+        _, first = np.unique(rows * self.n + ids, return_index=True)
+        first.sort()
+        return nearest_lists(rows[first], ids[first], first, len(centres),
+                             k)
+
+    @property
+    def candidates(self):
+        return getattr(self.index, 'candidates', 0)
+
+    def query_radius_many(self, centres, radius, return_distances=False):
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        x, y = self._wrap(centres[:, 0], centres[:, 1])
+        offsets, indices, d2 = self.index.query_radius_many(
+            np.column_stack((x, y)), radius, return_distances=True)
+        if return_distances:
+            return offsets, self.ids[indices], d2
+        return offsets, self.ids[indices]
+
+    def query_pairs(self, radius, return_distances=False):
+        """Find every pair of points within radius of each other, wrapped.
+
+        A pair straddling an edge is found twice, once from either point to
+        the other's ghost; only the one found from the real entry of the
+        lower numbered point is kept.
+
+        """
+        a, b, d2 = self.index.query_pairs(radius, return_distances=True)
+        ia, ib = self.ids[a], self.ids[b]
+        keep = np.where(ia < ib, self.real[a], self.real[b]) & (ia != ib)
+        return pair_lists(ia[keep], ib[keep], d2[keep], return_distances)
+
+
+def _ghosts(xs, ys, period, origin, margin):
+    """Yield (dx, dy, ids) for the points (xs, ys) shifted by (dx, dy).
+
+    Each point lies in the box [origin, origin + period), and gets a ghost
+    for each edge or corner within margin of it.
+
+    """
+    (w, h), (x0, y0) = period, origin
+    # Which way each point may be shifted, by axis: 0 always works.
+    shifts_x = {0: None, w: xs < x0 + margin, -w: xs >= x0 + w - margin}
+    shifts_y = {0: None, h: ys < y0 + margin, -h: ys >= y0 + h - margin}
+    for dx, near_x in shifts_x.items():
+        for dy, near_y in shifts_y.items():
+            if near_x is None and near_y is None:
+                continue
+            near = near_x if near_y is None else (
+                near_y if near_x is None else near_x & near_y)
+            yield dx, dy, np.flatnonzero(near)
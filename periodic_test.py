@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from periodic import PeriodicIndex
+from quadtree import FlatQuadTree, Point
+from spatial_hash import SpatialHash
+
+PERIOD = np.array([1920, 1080])
+
+
+def points(n=500, seed=5):
+    """Points crowding the edges and corners, some outside the box."""
+    rng = np.random.default_rng(seed)
+    corners = rng.normal(0, 50, (n // 2, 2))
+    edges = rng.uniform(0, 1, (n - n // 2, 2)) * PERIOD
+    edges[::2, 0] = rng.normal(1920, 30, len(edges[::2]))
+    edges[1::2, 1] = rng.normal(0, 30, len(edges[1::2]))
+    return np.vstack([corners, edges, [[0, 0], [1919.5, 1079.5]]])
+
+
+def min_image_d2(centres, pos):
+    delta = pos[None, :, :] - centres[:, None, :]
+    delta -= PERIOD * np.rint(delta / PERIOD)
+    return np.einsum('ijk,ijk->ij', delta, delta)
+
+
+def build(pos, index, inserted):
+    """A PeriodicIndex over pos, its last inserted points added one by one."""
+    n = len(pos) - inserted
+    tree = PeriodicIndex.from_arrays(pos[:n, 0], pos[:n, 1], period=PERIOD,
+                                     index=index)
+    for i, (x, y) in enumerate(pos[n:].tolist(), n):
+        assert tree.insert(Point(x, y, i))
+    assert len(tree) == len(pos)
+    return tree
+
+
+@pytest.mark.parametrize("inserted", [0, 60])
+@pytest.mark.parametrize("index", [SpatialHash, FlatQuadTree])
+def test_query_radius_many_uses_minimum_image(index, inserted):
+    pos = points()
+    tree = build(pos, index, inserted)
+    centres = np.vstack([pos, [[-10, -10], [1925, 540], [960, 1090]]])
+    offsets, indices, d2 = tree.query_radius_many(centres, 75,
+                                                  return_distances=True)
+    expected = min_image_d2(centres, pos)
+    for row, near in enumerate(expected <= 75**2):
+        found = indices[offsets[row]:offsets[row + 1]]
+        assert sorted(found.tolist()) == np.flatnonzero(near).tolist()
+        np.testing.assert_allclose(
+            d2[offsets[row]:offsets[row + 1]], expected[row, found],
+            atol=1e-6)
+
+
+@pytest.mark.parametrize("inserted", [0, 60])
+@pytest.mark.parametrize("index", [SpatialHash, FlatQuadTree])
+def test_query_pairs_finds_each_wrapped_pair_once(index, inserted):
+    pos = points()
+    first, second, d2 = build(pos, index, inserted).query_pairs(
+        75, return_distances=True)
+    assert (first < second).all()
+    found = set(zip(first.tolist(), second.tolist()))
+    assert len(found) == len(first)
+    expected = min_image_d2(pos, pos)
+    bf, bs = np.nonzero(np.triu(expected <= 75**2, k=1))
+    assert found == set(zip(bf.tolist(), bs.tolist()))
+    np.testing.assert_allclose(d2, expected[first, second], atol=1e-6)
+
+
+def test_corner_points_get_three_ghosts():
+    tree = PeriodicIndex.from_arrays([5, 960], [5, 540], period=PERIOD)
+    assert tree.ids.tolist() == [0, 1, 0, 0, 0]
+    tree.insert(Point(1915, 1075))
+    assert tree.ids.tolist() == [0, 1, 0, 0, 0, 2, 2, 2, 2]
+    assert tree.real.sum() == 3
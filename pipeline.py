@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+
+
+class PipelinedFlock:
+    """Advance a FlockState on a background thread, one frame ahead.
+
+    The simulation thread steps the flock and copies the result into the
+    back buffer while the render thread draws the front buffer. Once the
+    renderer has released the front buffer the two are swapped by
+    exchanging indices, so neither side ever copies or locks the buffer the
+    other one is using. Each buffer holds (positions, velocities) as a
+    (2, N, 2) array.
+
+    """
+
+    def __init__(self, state, dt_ms=60):
+        self.state = state
+        self.dt_ms = dt_ms
+        n = len(state)
+        self._buffers = [np.empty((2, n, 2)), np.empty((2, n, 2))]
+        self._buffers[0][0] = state.positions
+        self._buffers[0][1] = state.velocities
+        self._front, self._back = 0, 1
+
+        self._ready = threading.Event()
+        self._released = threading.Event()
+        self._ready.set()
+        self._stop = False
+        self.error = None
+        self._thread = threading.Thread(target=self._simulate, daemon=True)
+        self._thread.start()
+
+    def _simulate(self):
+        try:
+            while not self._stop:
+                self.state.step(self.dt_ms)
+                back = self._buffers[self._back]
+                back[0] = self.state.positions
+                back[1] = self.state.velocities
+                self._released.wait()
+                self._released.clear()
+                if self._stop:
+                    break
+                self._front, self._back = self._back, self._front
+                self._ready.set()
+        except Exception as error:
+            self.error = error
+
+    def acquire(self):
+        """Wait for the next frame and return its buffer to draw from."""
+        while not self._ready.wait(0.1):
+            if not self._thread.is_alive():
+                raise RuntimeError("simulation thread stopped") from self.error
+        self._ready.clear()
+        return self._buffers[self._front]
+
+    def release(self):
+        """Hand the front buffer back once the frame has been drawn."""
+        self._released.set()
+
+    def close(self):
+        """Stop the simulation thread."""
+        self._stop = True
+        self._released.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
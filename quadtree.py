@@ -1,18 +1,26 @@
 # source: https://scipython.com/blog/quadtrees-2-implementation-in-python/ 
 # author: christian
 
+import heapq
+import math
+
 import numpy as np
 
+from spatial_index import (ArrayIndex, SpatialIndex, concat_ranges,
+                           nearest_lists, neighbor_lists, pair_lists)
+
 class Point:
     """A point located at (x,y) in 2D space.
 
-    Each Point object may be associated with a payload object.
+    Each Point object may be associated with a payload object. node is the
+    QuadTree node currently holding the point, if any.
 
     """
 
     def __init__(self, x, y, payload=None):
         self.x, self.y = x, y
         self.payload = payload
+        self.node = None
 
     def __repr__(self):
         return '{}: {}'.format(str((self.x, self.y)), repr(self.payload))
@@ -78,16 +86,17 @@ class Rect:
         ax.plot([x1,x2,x2,x1,x1],[y1,y1,y2,y2,y1], c=c, lw=lw, **kwargs)
 
 
-class QuadTree:
+class QuadTree(SpatialIndex):
     """A class implementing a quadtree."""
 
-    def __init__(self, boundary, max_points=4, depth=0):
+    def __init__(self, boundary, max_points=4, depth=0, parent=None):
         """Initialize this node of the quadtree.
 
         boundary is a Rect object defining the region from which points are
         placed into this node; max_points is the maximum number of points the
         node can hold before it must divide (branch into four more nodes);
-        depth keeps track of how deep into the quadtree this node lies.
+        depth keeps track of how deep into the quadtree this node lies and
+        parent is the node this one was divided from.
 
         """
 
@@ -95,6 +104,7 @@ class QuadTree:
         self.max_points = max_points
         self.points = []
         self.depth = depth
+        self.parent = parent
         # A flag to indicate whether this node has divided (branched) or not.
         self.divided = False
 
@@ -118,13 +128,13 @@ class QuadTree:
         # "northeast", "southeast" and "southwest" quadrants within the
         # boundary of the current node.
         self.nw = QuadTree(Rect(cx - w/2, cy - h/2, w, h),
-                                    self.max_points, self.depth + 1)
+                                    self.max_points, self.depth + 1, self)
         self.ne = QuadTree(Rect(cx + w/2, cy - h/2, w, h),
-                                    self.max_points, self.depth + 1)
+                                    self.max_points, self.depth + 1, self)
         self.se = QuadTree(Rect(cx + w/2, cy + h/2, w, h),
-                                    self.max_points, self.depth + 1)
+                                    self.max_points, self.depth + 1, self)
         self.sw = QuadTree(Rect(cx - w/2, cy + h/2, w, h),
-                                    self.max_points, self.depth + 1)
+                                    self.max_points, self.depth + 1, self)
         self.divided = True
 
     def insert(self, point):
@@ -136,6 +146,7 @@ class QuadTree:
         if len(self.points) < self.max_points:
             # There's room for our point without dividing the QuadTree.
             self.points.append(point)
+            point.node = self
             return True
 
         # No room: divide if necessary, then try the sub-quads.
@@ -147,13 +158,77 @@ class QuadTree:
                 self.se.insert(point) or
                 self.sw.insert(point))
 
+    def remove(self, point):
+        """Remove Point point from the quadtree it was inserted into.
+
+        Nodes left with few enough points to fit into their parent are
+        collapsed back into it.
+
+        """
+
+        node = point.node
+        if node is None:
+            return False
+        node.points.remove(point)
+        point.node = None
+        node.collapse()
+        return True
+
+    def move(self, point, new_x, new_y):
+        """Move Point point, already in this quadtree, to (new_x, new_y).
+
+        This must be called on the root node. The point only changes node
+        when it leaves the boundary of the one holding it; it is then
+        re-inserted from the nearest ancestor that contains it, and the node
+        it left is collapsed if it became sparse. Returns False if the point
+        ended up outside the quadtree altogether.
+
+        """
+
+        node = point.node
+        point.x, point.y = new_x, new_y
+        if node is not None and node.boundary.contains(point):
+            return True
+
+        if node is not None:
+            node.points.remove(point)
+            point.node = None
+        target = node
+        while target is not None and not target.boundary.contains(point):
+            target = target.parent
+        inserted = (target or self).insert(point)
+        if node is not None:
+            node.collapse()
+        return inserted
+
+    def collapse(self):
+        """Merge sparse subtrees back into their parents, walking up."""
+
+        node = self
+        while node is not None:
+            if node.divided:
+                children = (node.nw, node.ne, node.se, node.sw)
+                if any(child.divided for child in children):
+                    return
+                count = len(node.points) + sum(len(child.points)
+                                               for child in children)
+                if count > node.max_points:
+                    return
+                for child in children:
+                    for point in child.points:
+                        point.node = node
+                    node.points.extend(child.points)
+                del node.nw, node.ne, node.se, node.sw
+                node.divided = False
+            node = node.parent
+
     def query(self, boundary, found_points):
         """Find the points in the quadtree that lie within boundary."""
 
         if not self.boundary.intersects(boundary):
             # If the domain of this node does not intersect the search
             # region, we don't need to look in it for points.
-            return False
+            return found_points
 
         # Search this node's points to see if they lie within boundary ...
         for point in self.points:
@@ -179,7 +254,7 @@ class QuadTree:
         if not self.boundary.intersects(boundary):
             # If the domain of this node does not intersect the search
             # region, we don't need to look in it for points.
-            return False
+            return found_payloads
 
         # Search this node's points to see if they lie within boundary
         # and also lie within a circle of given radius around the centre point.
@@ -204,6 +279,85 @@ class QuadTree:
         boundary = Rect(*centre, 2*radius, 2*radius)
         return self.query_circle(boundary, centre, radius, found_payloads)
 
+    def query_knn(self, centre, k, max_radius=math.inf):
+        """Find the payloads of the k points nearest to centre.
+
+        Nodes and points share one heap keyed by their squared distance
+        from centre (for a node, from the closest point of its boundary),
+        so they are visited nearest-first and the search stops as soon as
+        k points have come off the heap.
+
+        """
+
+        cx, cy = centre
+        r2 = max_radius**2
+        heap = [(0.0, 0, self)]
+        tie = 1
+        found = []
+        while heap and len(found) < k:
+            d2, _, item = heapq.heappop(heap)
+            if d2 > r2:
+                break
+            if isinstance(item, Point):
+                found.append(item.payload)
+                continue
+            for point in item.points:
+                heapq.heappush(heap, (point.distance_squared_to(centre), tie,
+                                      point))
+                tie += 1
+            if item.divided:
+                for node in (item.nw, item.ne, item.se, item.sw):
+                    b = node.boundary
+                    dx = max(b.west_edge - cx, 0, cx - b.east_edge)
+                    dy = max(b.north_edge - cy, 0, cy - b.south_edge)
+                    heapq.heappush(heap, (dx*dx + dy*dy, tie, node))
+                    tie += 1
+        return found
+
+    def query_radius_many(self, centres, radius, return_distances=False):
+        """Find the points within radius of each centre, one at a time.
+
+        The points are named by their payloads, which should be integers.
+
+        """
+
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        rows, cols, d2 = [], [], []
+        for i, centre in enumerate(centres.tolist()):
+            found = []
+            self.query(Rect(*centre, 2*radius, 2*radius), found)
+            for point in found:
+                dist = point.distance_squared_to(centre)
+                if dist <= radius**2:
+                    rows.append(i)
+                    cols.append(point.payload)
+                    d2.append(dist)
+        return neighbor_lists(np.array(rows, dtype=np.intp),
+                              np.array(cols, dtype=np.intp), np.array(d2),
+                              len(centres), return_distances)
+
+    def query_pairs(self, radius, return_distances=False):
+        """Find every pair of points within radius of each other.
+
+        The points are named by their payloads, which should be integers.
+
+        """
+
+        points = []
+        self.query(self.boundary, points)
+        first, second, d2 = [], [], []
+        for point in points:
+            found = []
+            self.query(Rect(point.x, point.y, 2*radius, 2*radius), found)
+            for other in found:
+                dist = point.distance_squared_to(other)
+                if point.payload < other.payload and dist <= radius**2:
+                    first.append(point.payload)
+                    second.append(other.payload)
+                    d2.append(dist)
+        return pair_lists(np.array(first, dtype=np.intp),
+                          np.array(second, dtype=np.intp), np.array(d2),
+                          return_distances)
 
     def __len__(self):
         """Return the number of points in the quadtree."""
@@ -221,4 +375,406 @@ class QuadTree:
             self.nw.draw(ax)
             self.ne.draw(ax)
             self.se.draw(ax)
-            self.sw.draw(ax)
\ No newline at end of file
+            self.sw.draw(ax)
+
+    @classmethod
+    def from_arrays(cls, xs, ys, payloads=None, boundary=None, max_points=4):
+        """Bulk-build an array-backed quadtree over the points (xs, ys).
+
+        Returns a FlatQuadTree, which answers query and query_radius with
+        the same points as a QuadTree filled by calling insert() for every
+        point, without building a Python object per node.
+
+        """
+        return FlatQuadTree(xs, ys, payloads, boundary, max_points)
+
+
+# Points are quantized to a 2**MAX_DEPTH grid to compute their Morton codes,
+# which also bounds the depth of a FlatQuadTree.
+MAX_DEPTH = 16
+
+
+def _part1by1(v):
+    """Spread the low 16 bits of v so that a zero bit sits between each."""
+    v = v.astype(np.uint64) & 0x0000ffff
+    v = (v | (v << 8)) & 0x00ff00ff
+    v = (v | (v << 4)) & 0x0f0f0f0f
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+class FlatQuadTree(ArrayIndex):
+    """A quadtree stored in flat arrays rather than as a graph of nodes.
+
+    The points are sorted along a Morton (Z-order) curve so that every node
+    owns a contiguous range of them. Node i has bounds[i] = (west, north,
+    east, south), the tight box around its points, and holds the sorted
+    points start[i]:end[i]. Its four children, if any, are the nodes
+    child[i] to child[i] + 3; leaves have child[i] == -1. Only leaves are
+    searched for points.
+
+    Points added with insert() are kept aside and the tree is rebuilt on
+    the next query. Without a boundary, the tree grows to take them in.
+
+    """
+
+    def __init__(self, xs, ys, payloads=None, boundary=None, max_points=4):
+        self.fitted = boundary is None
+        self.boundary = boundary
+        self.max_points = max_points
+        self.pending = []
+        # How many points the last query_knn_many measured.
+        self.candidates = 0
+        self._set_points(np.asarray(xs, dtype=np.float64),
+                         np.asarray(ys, dtype=np.float64), payloads)
+
+    @classmethod
+    def from_arrays(cls, xs, ys, payloads=None, boundary=None, max_points=4):
+        return cls(xs, ys, payloads, boundary, max_points)
+
+    def _set_points(self, xs, ys, payloads):
+        self._xs_in, self._ys_in = xs, ys
+        self.payloads = payloads
+        if self.fitted:
+            # A box just large enough to contain every point.
+            west, north = (xs.min(), ys.min()) if len(xs) else (0, 0)
+            east, south = (xs.max(), ys.max()) if len(xs) else (1, 1)
+            pad = 1e-6 * max(east - west, south - north, 1)
+            self.boundary = Rect((west + east)/2, (north + south)/2,
+                                 east - west + 2*pad, south - north + 2*pad)
+        boundary = self.boundary
+
+        # Points outside the boundary are dropped, as QuadTree.insert does.
+        inside = ((boundary.west_edge <= xs) & (xs < boundary.east_edge) &
+                  (boundary.north_edge <= ys) & (ys < boundary.south_edge))
+        index = np.flatnonzero(inside)
+        codes = self._morton(xs[index], ys[index])
+        order = np.argsort(codes, kind='stable')
+        self._nodes = self._xs = self._ys = self._order = None
+        self.codes = codes[order]
+        self.order = index[order]
+        self.xs = xs[self.order]
+        self.ys = ys[self.order]
+        self._build()
+
+    def insert(self, point):
+        """Add Point point, if it lies within a given boundary."""
+        if not self.fitted and not self.boundary.contains(point):
+            return False
+        self.pending.append(point)
+        return True
+
+    def _morton(self, xs, ys):
+        """The Morton codes of (xs, ys), clamped onto the boundary."""
+        boundary = self.boundary
+        scale = 2**MAX_DEPTH
+        qx = (xs - boundary.west_edge) / boundary.w * scale
+        qy = (ys - boundary.north_edge) / boundary.h * scale
+        qx = np.clip(qx, 0, scale - 1).astype(np.int64)
+        qy = np.clip(qy, 0, scale - 1).astype(np.int64)
+        return _part1by1(qx) | (_part1by1(qy) << np.uint64(1))
+
+    def _build(self):
+        """Split nodes level by level until every leaf is small enough."""
+        starts = [np.array([0])]
+        ends = [np.array([len(self.codes)])]
+        children = []
+        prefixes = np.zeros(1, dtype=np.uint64)
+        first = 0
+        for depth in range(MAX_DEPTH + 1):
+            level_starts, level_ends = starts[-1], ends[-1]
+            child = np.full(len(level_starts), -1, dtype=np.intp)
+            split = (level_ends - level_starts) > self.max_points
+            children.append(child)
+            if depth == MAX_DEPTH or not split.any():
+                break
+            # Children of a split node are the four next Morton digits; each
+            # one's points start where its code range starts.
+            shift = np.uint64(2 * (MAX_DEPTH - depth - 1))
+            prefixes = (prefixes[split][:, None] * np.uint64(4) +
+                        np.arange(4, dtype=np.uint64)).ravel()
+            child_starts = np.searchsorted(self.codes, prefixes << shift)
+            child_ends = np.append(child_starts.reshape(-1, 4)[:, 1:],
+                                   level_ends[split][:, None], axis=1)
+            first += len(level_starts)
+            child[split] = first + 4 * np.arange(split.sum())
+            starts.append(child_starts)
+            ends.append(child_ends.ravel())
+
+        self.start = np.concatenate(starts)
+        self.end = np.concatenate(ends)
+        self.child = np.concatenate(children)
+        self.depth = np.repeat(np.arange(len(starts)),
+                               [len(level) for level in starts])
+
+        # Tight boxes around the points of every node. Empty nodes keep an
+        # inverted box so that they never intersect a query.
+        self.bounds = np.empty((len(self.start), 4))
+        self.bounds[:, :2] = np.inf
+        self.bounds[:, 2:] = -np.inf
+        leaves = np.flatnonzero((self.child < 0) & (self.end > self.start))
+        leaves = leaves[np.argsort(self.start[leaves])]
+        if len(leaves):
+            s = self.start[leaves]
+            self.bounds[leaves, 0] = np.minimum.reduceat(self.xs, s)
+            self.bounds[leaves, 1] = np.minimum.reduceat(self.ys, s)
+            self.bounds[leaves, 2] = np.maximum.reduceat(self.xs, s)
+            self.bounds[leaves, 3] = np.maximum.reduceat(self.ys, s)
+        for depth in range(len(starts) - 2, -1, -1):
+            parents = np.flatnonzero((self.depth == depth) & (self.child >= 0))
+            b = self.bounds[self.child[parents][:, None] + np.arange(4)]
+            self.bounds[parents, :2] = b[:, :, :2].min(axis=1)
+            self.bounds[parents, 2:] = b[:, :, 2:].max(axis=1)
+
+    def __len__(self):
+        """Return the number of points in the quadtree."""
+        return len(self.order) + len(self.pending)
+
+    @property
+    def node_count(self):
+        self._flush()
+        return len(self.start)
+
+    @property
+    def max_depth(self):
+        self._flush()
+        return int(self.depth.max())
+
+    def _node_lists(self):
+        if self._nodes is None:
+            self._nodes = (self.bounds.tolist(), self.child.tolist(),
+                           self.start.tolist(), self.end.tolist())
+        return self._nodes
+
+    def _candidates(self, west, north, east, south):
+        """Yield the sorted-point indices in the leaves touching the box.
+
+        Single queries touch a handful of nodes, so the walk runs over
+        Python lists of the node arrays: per-node NumPy calls would cost
+        more than the work they save.
+
+        """
+        bounds, child, start, end = self._node_lists()
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            w, n, e, s = bounds[node]
+            if w > east or e < west or n > south or s < north:
+                continue
+            c = child[node]
+            if c < 0:
+                yield from range(start[node], end[node])
+            else:
+                stack.extend((c, c + 1, c + 2, c + 3))
+
+    def query(self, boundary, found_points):
+        """Find the points in the quadtree that lie within boundary."""
+
+        self._flush()
+        xs, ys = self._coords()
+        for i in self._candidates(boundary.west_edge, boundary.north_edge,
+                                  boundary.east_edge, boundary.south_edge):
+            if boundary.contains((xs[i], ys[i])):
+                found_points.append(Point(xs[i], ys[i],
+                                          self._payload(self._order[i])))
+        return found_points
+
+    def query_radius(self, centre, radius, found_payloads):
+        """Find the points in the quadtree that lie within radius of centre."""
+
+        self._flush()
+        cx, cy = centre
+        r2 = radius**2
+        xs, ys = self._coords()
+        order = self._order
+        payloads = self.payloads
+        for i in self._candidates(cx - radius, cy - radius,
+                                  cx + radius, cy + radius):
+            if (xs[i] - cx)**2 + (ys[i] - cy)**2 <= r2:
+                found_payloads.append(order[i] if payloads is None
+                                      else payloads[order[i]])
+        return found_payloads
+
+    def query_knn(self, centre, k, max_radius=math.inf):
+        """Find the payloads of the k points nearest to centre.
+
+        Nodes are pushed on a heap keyed by the squared distance from
+        centre to their bounds and the points of a leaf by their own, so
+        the search stops as soon as k points have come off the heap.
+
+        """
+
+        self._flush()
+        bounds, child, start, end = self._node_lists()
+        xs, ys = self._coords()
+        cx, cy = centre
+        r2 = max_radius**2
+        heap = [(0.0, 0, False)]
+        found = []
+        while heap and len(found) < k:
+            d2, item, is_point = heapq.heappop(heap)
+            if d2 > r2:
+                break
+            if is_point:
+                found.append(self._payload(self._order[item]))
+            elif child[item] < 0:
+                for i in range(start[item], end[item]):
+                    heapq.heappush(heap, ((xs[i] - cx)**2 + (ys[i] - cy)**2,
+                                          i, True))
+            else:
+                for node in range(child[item], child[item] + 4):
+                    w, n, e, s = bounds[node]
+                    if w > e:
+                        # Empty nodes have inverted bounds.
+                        continue
+                    dx = max(w - cx, 0, cx - e)
+                    dy = max(n - cy, 0, cy - s)
+                    heapq.heappush(heap, (dx*dx + dy*dy, node, False))
+        return found
+
+    def query_knn_many(self, centres, k, max_radius=math.inf):
+        """Find the k points nearest to every centre in one pass.
+
+        Each centre first gets an upper bound on the distance to its k-th
+        nearest point: the furthest of k points next to it in Morton order,
+        inside the smallest node around it that holds k. The leaves within
+        that distance are then searched as in query_radius_many. The bound
+        follows the local density, so the points measured per centre stay
+        a small multiple of k however crowded the points get.
+
+        """
+        self._flush()
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        m = len(centres)
+        k = min(k, len(self.xs))
+        if k <= 0:
+            self.candidates = 0
+            return np.zeros(m + 1, dtype=np.intp), np.zeros(0, np.intp)
+        cx, cy = centres[:, 0], centres[:, 1]
+        r2 = np.minimum(self._knn_bounds(cx, cy, k), max_radius**2)
+        query, starts, ends = self._leaf_ranges(cx, cy, np.sqrt(r2))
+        idx = concat_ranges(starts, ends)
+        query = np.repeat(query, ends - starts)
+        self.candidates = len(idx)
+        dx = self.xs[idx] - cx[query]
+        dy = self.ys[idx] - cy[query]
+        d2 = dx*dx + dy*dy
+        keep = d2 <= r2[query]
+        return nearest_lists(query[keep], self.order[idx[keep]], d2[keep],
+                             m, k)
+
+    def _knn_bounds(self, cx, cy, k):
+        """An upper bound on the squared k-th nearest distance per centre."""
+        codes = self._morton(cx, cy)
+        count = self.end - self.start
+        node = np.zeros(len(cx), dtype=np.intp)
+        active = np.ones(len(cx), dtype=bool)
+        for depth in range(MAX_DEPTH):
+            # Step into the child the centre falls in while it holds k.
+            child = self.child[node]
+            shift = np.uint64(2 * (MAX_DEPTH - depth - 1))
+            digit = ((codes >> shift) & np.uint64(3)).astype(np.intp)
+            inner = np.where(child >= 0, child + digit, 0)
+            active &= (child >= 0) & (count[inner] >= k)
+            if not active.any():
+                break
+            node = np.where(active, inner, node)
+        start, end = self.start[node], self.end[node]
+        first = np.clip(np.searchsorted(self.codes, codes) - k // 2,
+                        start, end - k)
+        idx = first[:, None] + np.arange(k)
+        dx = self.xs[idx] - cx[:, None]
+        dy = self.ys[idx] - cy[:, None]
+        # A hair over, so the k-th point survives rounding in the search.
+        return (dx*dx + dy*dy).max(axis=1) * (1 + 1e-9)
+
+    def query_radius_many(self, centres, radius, return_distances=False):
+        """Find the points within radius of every centre in one pass.
+
+        All queries descend the tree together, one level per iteration, as
+        (query, node) pairs; a pair survives while the node's bounds come
+        within radius of the centre.
+
+        """
+        self._flush()
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        m = len(centres)
+        cx, cy = centres[:, 0], centres[:, 1]
+        query, starts, ends = self._leaf_ranges(cx, cy, radius)
+        idx = concat_ranges(starts, ends)
+        query = np.repeat(query, ends - starts)
+        dx = self.xs[idx] - cx[query]
+        dy = self.ys[idx] - cy[query]
+        d2 = dx*dx + dy*dy
+        keep = d2 <= radius**2
+        return neighbor_lists(query[keep], self.order[idx[keep]], d2[keep],
+                              m, return_distances)
+
+    def query_pairs(self, radius, return_distances=False):
+        """Find every pair of points within radius of each other.
+
+        The points search the tree as in query_radius_many, but each one
+        only measures the points after it in Morton order, so every pair is
+        measured once.
+
+        """
+        self._flush()
+        query, starts, ends = self._leaf_ranges(self.xs, self.ys, radius)
+        starts = np.maximum(starts, query + 1)
+        ends = np.maximum(ends, starts)
+        idx = concat_ranges(starts, ends)
+        query = np.repeat(query, ends - starts)
+        dx = self.xs[idx] - self.xs[query]
+        dy = self.ys[idx] - self.ys[query]
+        d2 = dx*dx + dy*dy
+        keep = d2 <= radius**2
+        return pair_lists(self.order[query[keep]], self.order[idx[keep]],
+                          d2[keep], return_distances)
+
+    def _leaf_ranges(self, cx, cy, radius):
+        """(query, start, end) for every leaf within radius of a centre.
+
+        radius is one for all centres or one for each. The leaves' points
+        are xs[start:end]; the triples come sorted by query.
+
+        """
+        r2 = np.broadcast_to(np.square(radius, dtype=np.float64), cx.shape)
+        query = np.arange(len(cx))
+        node = np.zeros(len(cx), dtype=np.intp)
+        leaf_queries = [np.zeros(0, dtype=np.intp)]
+        leaf_nodes = [np.zeros(0, dtype=np.intp)]
+        while len(query):
+            b = self.bounds[node]
+            x, y = cx[query], cy[query]
+            dx = np.maximum(np.maximum(b[:, 0] - x, x - b[:, 2]), 0)
+            dy = np.maximum(np.maximum(b[:, 1] - y, y - b[:, 3]), 0)
+            near = dx*dx + dy*dy <= r2[query]
+            query, node = query[near], node[near]
+            child = self.child[node]
+            leaf = child < 0
+            leaf_queries.append(query[leaf])
+            leaf_nodes.append(node[leaf])
+            query = np.repeat(query[~leaf], 4)
+            node = (child[~leaf][:, None] + np.arange(4)).ravel()
+
+        query = np.concatenate(leaf_queries)
+        node = np.concatenate(leaf_nodes)
+        by_query = np.argsort(query, kind='stable')
+        query, node = query[by_query], node[by_query]
+        return query, self.start[node], self.end[node]
+
+    def _coords(self):
+        if self._xs is None:
+            self._xs, self._ys = self.xs.tolist(), self.ys.tolist()
+            self._order = self.order.tolist()
+        return self._xs, self._ys
+
+    def draw(self, ax):
+        """Draw the tight bounds of every non-empty node on Axes ax."""
+
+        self._flush()
+        for west, north, east, south in self.bounds[self.end > self.start]:
+            Rect((west + east)/2, (north + south)/2,
+                 east - west, south - north).draw(ax)
+
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from quadtree import FlatQuadTree, Point, QuadTree, Rect
+
+WORLD = Rect(960, 540, 1920, 1080)
+
+
+def inserted(xs, ys, boundary=WORLD):
+    tree = QuadTree(boundary)
+    for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+        tree.insert(Point(x, y, i))
+    return tree
+
+
+def found(points):
+    return sorted((point.x, point.y, point.payload) for point in points)
+
+
+@pytest.mark.parametrize("fitted", [False, True])
+def test_from_arrays_matches_inserted_quadtree(fitted):
+    rng = np.random.default_rng(6)
+    # Some clumped, some spilling past the world's edges.
+    xs = np.concatenate([rng.normal(400, 20, 300),
+                         rng.uniform(-50, 1970, 700)])
+    ys = np.concatenate([rng.normal(300, 20, 300),
+                         rng.uniform(-50, 1130, 700)])
+    if fitted:
+        flat = FlatQuadTree.from_arrays(xs, ys)
+        tree = inserted(xs, ys, Rect(960, 540, 2200, 1400))
+    else:
+        flat = QuadTree.from_arrays(xs, ys, boundary=WORLD)
+        tree = inserted(xs, ys)
+    assert len(flat) == len(tree)
+    for cx, cy in rng.uniform((-300, -300), (2220, 1380), (200, 2)).tolist():
+        w, h = rng.uniform(1, 600, 2)
+        box = Rect(cx, cy, w, h)
+        assert found(flat.query(box, [])) == found(tree.query(box, []))
+        radius = rng.uniform(1, 300)
+        assert (sorted(flat.query_radius((cx, cy), radius, [])) ==
+                sorted(tree.query_radius((cx, cy), radius, [])))
+
+
+def nodes(tree):
+    yield tree
+    if tree.divided:
+        for child in (tree.nw, tree.ne, tree.se, tree.sw):
+            yield from nodes(child)
+
+
+def test_move_and_remove_keep_the_tree_consistent():
+    rng = np.random.default_rng(7)
+    tree = QuadTree(WORLD)
+    points = [Point(x, y, i) for i, (x, y) in enumerate(
+        rng.uniform((0, 0), (1920, 1080), (400, 2)).tolist())]
+    for point in points:
+        tree.insert(point)
+    live = set(range(len(points)))
+    for _ in range(2000):
+        point = points[rng.integers(len(points))]
+        if rng.random() < 0.1:
+            assert tree.remove(point) == (point.payload in live)
+            live.discard(point.payload)
+        else:
+            # Small steps mostly, and now and then off the world and back.
+            x, y = np.array([point.x, point.y]) + rng.normal(0, 60, 2)
+            if tree.move(point, x, y):
+                live.add(point.payload)
+            else:
+                assert not WORLD.contains((x, y))
+                live.discard(point.payload)
+
+    held = [point for node in nodes(tree) for point in node.points]
+    assert sorted(point.payload for point in held) == sorted(live)
+    for node in nodes(tree):
+        for point in node.points:
+            assert point.node is node
+            assert node.boundary.contains(point)
+    assert len(tree) == len(live)
+    assert found(tree.query(WORLD, [])) == found(points[i] for i in live)
+    for cx, cy in rng.uniform((0, 0), (1920, 1080), (50, 2)).tolist():
+        near = {i for i in live
+                if points[i].distance_squared_to((cx, cy)) <= 100**2}
+        assert sorted(tree.query_radius((cx, cy), 100, [])) == sorted(near)
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+
+# Every recording starts with an .npy header padded to this many bytes, so
+# the frame count can be rewritten in place as the file grows.
+HEADER_SIZE = 128
+MAGIC = b'\x93NUMPY\x01\x00'
+
+
+class Recorder:
+    """Stream the frames of a flock into an .npy file as they are simulated.
+
+    The file holds a (frames, 2, N, 2) float64 array, frame i being the
+    positions and velocities drawn on frame i. Frames are appended to the
+    end of the file one at a time, so nothing but the current frame is ever
+    held in memory, and the header's frame count is rewritten by flush()
+    and close(). The other keyword arguments, e.g. the seed the flock was
+    scattered with, are kept as JSON in a sidecar file next to it.
+
+    """
+
+    def __init__(self, path, n_actors, **meta):
+        self.path = path
+        self.n_actors = n_actors
+        self.frames = 0
+        self.meta = dict(meta, n_actors=n_actors)
+        self._file = open(path, 'wb')
+        self._file.write(_header(0, n_actors))
+        with open(_meta_path(path), 'w') as f:
+            json.dump(self.meta, f, indent=2)
+
+    def __len__(self):
+        return self.frames
+
+    def append(self, positions, velocities):
+        """Write one frame's (N, 2) positions and velocities."""
+        for array in (positions, velocities):
+            array = np.ascontiguousarray(array, dtype='<f8')
+            if array.shape != (self.n_actors, 2):
+                raise ValueError("expected ({}, 2) arrays, got {}".format(
+                    self.n_actors, array.shape))
+            self._file.write(array.data)
+        self.frames += 1
+
+    def flush(self):
+        """Make the frames written so far readable by Recording."""
+        self._file.flush()
+        end = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_header(self.frames, self.n_actors))
+        self._file.seek(end)
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Recording:
+    """A flock written by Recorder, memory-mapped for replay.
+
+    Indexing returns a frame's (positions, velocities) as views of the
+    mapping, so replaying reads straight from the page cache and costs
+    neither simulation nor copies. meta holds the sidecar's contents.
+
+    """
+
+    def __init__(self, path):
+        self.frames = np.load(path, mmap_mode='r')
+        if self.frames.ndim != 4 or self.frames.shape[1::2] != (2, 2):
+            raise ValueError("not a flock recording: {}".format(path))
+        if len(self.frames) == 0:
+            raise ValueError("recording has no frames: {}".format(path))
+        try:
+            with open(_meta_path(path)) as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            self.meta = {}
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def n_actors(self):
+        return self.frames.shape[2]
+
+    def __getitem__(self, i):
+        positions, velocities = self.frames[i]
+        return positions, velocities
+
+
+def _header(frames, n_actors):
+    """The fixed-size .npy header of a (frames, 2, n_actors, 2) array."""
+    header = repr({'descr': '<f8', 'fortran_order': False,
+                   'shape': (frames, 2, n_actors, 2)}).encode('latin1')
+    # Magic, a two byte length and the terminating newline.
+    room = HEADER_SIZE - len(MAGIC) - 3
+    if len(header) > room:
+        raise ValueError("recording too large for its header")
+    return (MAGIC + (room + 1).to_bytes(2, 'little') + header.ljust(room) +
+            b'\n')
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + '.json'
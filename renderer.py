@@ -0,0 +1,255 @@
+import numpy as np
+import pygame
+
+from lut import ROTATION
+
+
+class CircleRenderer:
+    """Draw each actor with its own pygame.draw.circle call.
+
+    This is what Actor.render does, kept as the reference to compare the
+    batched renderers against.
+
+    """
+
+    def __init__(self, radius=6, width=3):
+        self.radius = radius
+        self.width = width
+
+    def draw(self, surface, positions, color, velocities=None):
+        """Draw an actor glyph at each of the (N, 2) positions.
+
+        velocities are only used by renderers whose glyph shows a heading.
+
+        """
+        for position in positions:
+            pygame.draw.circle(surface, color, position, self.radius,
+                               self.width)
+
+
+class BlitRenderer(CircleRenderer):
+    """Draw the whole flock with a single Surface.blits() call.
+
+    The glyph is drawn once per color into a small cached Surface whose
+    background is a colorkey, and then copied to every actor position.
+
+    """
+
+    def __init__(self, radius=6, width=3):
+        super().__init__(radius, width)
+        self._glyphs = {}
+
+    def glyph(self, color):
+        """The cached glyph Surface for color."""
+        try:
+            return self._glyphs[color]
+        except KeyError:
+            pass
+        size = 2 * self.radius + 1
+        key = (0, 0, 0) if tuple(color[:3]) != (0, 0, 0) else (255, 0, 255)
+        glyph = pygame.Surface((size, size))
+        glyph.fill(key)
+        pygame.draw.circle(glyph, color, (self.radius, self.radius),
+                           self.radius, self.width)
+        glyph.set_colorkey(key, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            # Match the display's pixel format so blits need no conversion.
+            glyph = glyph.convert()
+        self._glyphs[color] = glyph
+        return glyph
+
+    def draw(self, surface, positions, color, velocities=None):
+        glyph = self.glyph(color)
+        # Truncate like pygame.draw does with float coordinates.
+        corners = (np.asarray(positions).astype(int) - self.radius).tolist()
+        surface.blits([(glyph, corner) for corner in corners], doreturn=False)
+
+
+class SurfarrayRenderer(BlitRenderer):
+    """Stamp the glyph's pixels straight into the target's pixel array.
+
+    All pixel coordinates covered by the flock are computed at once with
+    NumPy and written through a pygame.surfarray view with one fancy-index
+    assignment. Targets without 32-bit pixels are drawn by blitting, as
+    BlitRenderer does.
+
+    """
+
+    def __init__(self, radius=6, width=3):
+        super().__init__(radius, width)
+        self._offsets = {}
+
+    def offsets(self, color):
+        """(K, 2) pixel offsets of the glyph for color around its centre."""
+        try:
+            return self._offsets[color]
+        except KeyError:
+            pass
+        opaque = pygame.surfarray.array_colorkey(self.glyph(color)) > 0
+        offsets = np.argwhere(opaque) - self.radius
+        self._offsets[color] = offsets
+        return offsets
+
+    def draw(self, surface, positions, color, velocities=None):
+        if surface.get_bitsize() != 32:
+            return super().draw(surface, positions, color, velocities)
+        offsets = self.offsets(color)
+        pixels = (np.asarray(positions).astype(int)[:, None, :] +
+                  offsets[None, :, :]).reshape(-1, 2)
+        w, h = surface.get_size()
+        inside = ((pixels[:, 0] >= 0) & (pixels[:, 0] < w) &
+                  (pixels[:, 1] >= 0) & (pixels[:, 1] < h))
+        pixels = pixels[inside]
+        view = pygame.surfarray.pixels2d(surface)
+        view[pixels[:, 0], pixels[:, 1]] = surface.map_rgb(color)
+        # The surface stays locked while the view exists.
+        del view
+
+
+class GlyphRenderer:
+    """Draw every actor as the arrow of Actor.local_pts, facing its heading.
+
+    The heading angles of the whole flock are computed at once, their
+    rotation matrices gathered from the rotation LUT, and all the body
+    outlines transformed with a single einsum into an (N, 4, 2) array that
+    the polygons are drawn from.
+
+    """
+
+    def __init__(self, length=20, width=20, line_width=3, lut=ROTATION):
+        self.body = np.array([[length/2, 0],
+                              [-length/2, -width/2],
+                              [-length/4, 0],
+                              [-length/2, width/2]])
+        self.line_width = line_width
+        # The furthest corner, the stroke around it and a pixel for the
+        # polygon's rounding.
+        self.radius = (int(np.ceil(np.hypot(*self.body.T).max())) +
+                       line_width + 1)
+        self.lut = lut
+
+    def outlines(self, positions, velocities):
+        """The (N, 4, 2) body outlines of actors at positions."""
+        return (self.lut.rotate(self.body, velocities) +
+                np.asarray(positions)[:, None, :])
+
+    def draw(self, surface, positions, color, velocities=None):
+        for outline in self.outlines(positions, velocities).tolist():
+            pygame.draw.polygon(surface, color, outline, self.line_width)
+
+
+class SpeciesRenderer:
+    """Draw a flock of several species, each in its own color.
+
+    Wraps another renderer, which is called once per species with the
+    actors of that species. species holds each actor's row in colors.
+
+    """
+
+    def __init__(self, renderer, species, colors):
+        self.renderer = renderer
+        self.radius = renderer.radius
+        self.species = species
+        self.colors = [tuple(color) for color in np.asarray(colors).tolist()]
+
+    def draw(self, surface, positions, color, velocities=None):
+        """Draw the flock; color is ignored in favour of the species'."""
+        positions = np.asarray(positions)
+        if velocities is not None:
+            velocities = np.asarray(velocities)
+        for kind, kind_color in enumerate(self.colors):
+            members = self.species == kind
+            self.renderer.draw(surface, positions[members], kind_color,
+                               None if velocities is None
+                               else velocities[members])
+
+
+class DirtyRectRenderer:
+    """Redraw and push only the parts of the screen the flock touches.
+
+    Wraps another renderer. Each frame the tiles covered by the actors'
+    previous glyphs are cleared, the flock is drawn, and the tiles covered
+    by either the previous or the current glyphs are returned as merged
+    rectangles for pygame.display.update(). Dirty tiles are merged into
+    horizontal runs, and runs spanning the same columns on consecutive
+    tile rows into taller rectangles.
+
+    When the dirty tiles cover more than threshold of the screen, the whole
+    screen is redrawn instead and draw() returns None to ask for a full
+    pygame.display.flip().
+
+    """
+
+    def __init__(self, renderer, threshold=0.25, background=(0, 0, 0),
+                 tile=16):
+        self.renderer = renderer
+        self.threshold = threshold
+        self.background = background
+        self.tile = max(tile, 2 * renderer.radius + 1)
+        self._previous = None
+
+    def _tiles(self, positions, shape):
+        """Boolean grid of the tiles touched by glyphs at positions."""
+        dirty = np.zeros(shape, dtype=bool)
+        if len(positions) == 0:
+            return dirty
+        r = self.renderer.radius
+        corners = np.asarray(positions).astype(int)
+        # A glyph is no larger than a tile, so its two opposite corners
+        # name every tile it touches.
+        lo = (corners - r) // self.tile
+        hi = (corners + r) // self.tile
+        for xs in (lo[:, 0], hi[:, 0]):
+            for ys in (lo[:, 1], hi[:, 1]):
+                inside = ((xs >= 0) & (xs < shape[1]) &
+                          (ys >= 0) & (ys < shape[0]))
+                dirty[ys[inside], xs[inside]] = True
+        return dirty
+
+    def _rects(self, dirty):
+        """Merge the dirty tiles into as few pygame.Rects as is cheap."""
+        rows, cols = dirty.shape
+        padded = np.zeros((rows, cols + 2), dtype=np.int8)
+        padded[:, 1:-1] = dirty
+        edges = np.diff(padded.ravel())
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        t = self.tile
+        rects = []
+        open_runs = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            row, c0 = divmod(start, cols + 2)
+            c1 = end - row * (cols + 2)
+            rect = open_runs.get((c0, c1))
+            if rect is not None and rect.bottom == row * t:
+                rect.height += t
+            else:
+                rect = pygame.Rect(c0 * t, row * t, (c1 - c0) * t, t)
+                rects.append(rect)
+                open_runs[(c0, c1)] = rect
+        return rects
+
+    def draw(self, surface, positions, color, velocities=None):
+        """Draw the flock; return the rects to update, or None to flip."""
+        w, h = surface.get_size()
+        shape = (-(-h // self.tile), -(-w // self.tile))
+        current = self._tiles(positions, shape)
+        previous = self._previous
+        self._previous = current
+        if previous is None or previous.shape != shape:
+            dirty = None
+        else:
+            dirty = current | previous
+            if dirty.mean() > self.threshold:
+                dirty = None
+
+        if dirty is None:
+            surface.fill(self.background)
+            self.renderer.draw(surface, positions, color, velocities)
+            return None
+
+        rects = self._rects(previous)
+        for rect in rects:
+            surface.fill(self.background, rect)
+        self.renderer.draw(surface, positions, color, velocities)
+        return [rect.clip(surface.get_rect()) for rect in self._rects(dirty)]
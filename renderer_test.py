@@ -0,0 +1,35 @@
+import numpy as np
+import pygame
+import pytest
+
+from renderer import (BlitRenderer, DirtyRectRenderer, GlyphRenderer,
+                      SurfarrayRenderer)
+
+
+@pytest.mark.parametrize("depth", [16, 24, 32])
+def test_surfarray_matches_blit(depth):
+    positions = np.array([[10.5, 12.0], [40.0, 3.0], [-2.0, 30.0]])
+    surfaces = []
+    for renderer in (BlitRenderer(), SurfarrayRenderer()):
+        surface = pygame.Surface((64, 32), 0, depth)
+        renderer.draw(surface, positions, (255, 255, 0))
+        surfaces.append(pygame.surfarray.array3d(surface))
+    np.testing.assert_array_equal(*surfaces)
+
+
+def test_dirty_rects_leave_no_glyph_trails():
+    rng = np.random.default_rng(0)
+    positions = rng.uniform((20, 20), (300, 220), (10, 2))
+    velocities = rng.normal(size=(10, 2))
+    glyph = GlyphRenderer()
+    dirty = DirtyRectRenderer(GlyphRenderer(), threshold=1)
+    surface = pygame.Surface((320, 240), 0, 32)
+    clean = pygame.Surface((320, 240), 0, 32)
+    for _ in range(60):
+        positions = (positions + 2 * velocities) % (320, 240)
+        velocities += rng.normal(scale=0.3, size=velocities.shape)
+        dirty.draw(surface, positions, (255, 255, 255), velocities)
+        clean.fill((0, 0, 0))
+        glyph.draw(clean, positions, (255, 255, 255), velocities)
+        np.testing.assert_array_equal(pygame.surfarray.array2d(surface),
+                                      pygame.surfarray.array2d(clean))
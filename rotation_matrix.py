@@ -1,361 +0,0 @@
-[[ 1. -0.]
- [ 0.  1.]],[[ 0.9998477  -0.01745241]
- [ 0.01745241  0.9998477 ]],[[ 0.99939083 -0.0348995 ]
- [ 0.0348995   0.99939083]],[[ 0.99862953 -0.05233596]
- [ 0.05233596  0.99862953]],[[ 0.99756405 -0.06975647]
- [ 0.06975647  0.99756405]],[[ 0.9961947  -0.08715574]
- [ 0.08715574  0.9961947 ]],[[ 0.9945219  -0.10452846]
- [ 0.10452846  0.9945219 ]],[[ 0.99254615 -0.12186934]
- [ 0.12186934  0.99254615]],[[ 0.99026807 -0.1391731 ]
- [ 0.1391731   0.99026807]],[[ 0.98768834 -0.15643447]
- [ 0.15643447  0.98768834]],[[ 0.98480775 -0.17364818]
- [ 0.17364818  0.98480775]],[[ 0.98162718 -0.190809  ]
- [ 0.190809    0.98162718]],[[ 0.9781476  -0.20791169]
- [ 0.20791169  0.9781476 ]],[[ 0.97437006 -0.22495105]
- [ 0.22495105  0.97437006]],[[ 0.97029573 -0.2419219 ]
- [ 0.2419219   0.97029573]],[[ 0.96592583 -0.25881905]
- [ 0.25881905  0.96592583]],[[ 0.9612617  -0.27563736]
- [ 0.27563736  0.9612617 ]],[[ 0.95630476 -0.2923717 ]
- [ 0.2923717   0.95630476]],[[ 0.95105652 -0.30901699]
- [ 0.30901699  0.95105652]],[[ 0.94551858 -0.32556815]
- [ 0.32556815  0.94551858]],[[ 0.93969262 -0.34202014]
- [ 0.34202014  0.93969262]],[[ 0.93358043 -0.35836795]
- [ 0.35836795  0.93358043]],[[ 0.92718385 -0.37460659]
- [ 0.37460659  0.92718385]],[[ 0.92050485 -0.39073113]
- [ 0.39073113  0.92050485]],[[ 0.91354546 -0.40673664]
- [ 0.40673664  0.91354546]],[[ 0.90630779 -0.42261826]
- [ 0.42261826  0.90630779]],[[ 0.89879405 -0.43837115]
- [ 0.43837115  0.89879405]],[[ 0.89100652 -0.4539905 ]
- [ 0.4539905   0.89100652]],[[ 0.88294759 -0.46947156]
- [ 0.46947156  0.88294759]],[[ 0.87461971 -0.48480962]
- [ 0.48480962  0.87461971]],[[ 0.8660254 -0.5      ]
- [ 0.5        0.8660254]],[[ 0.8571673  -0.51503807]
- [ 0.51503807  0.8571673 ]],[[ 0.8480481  -0.52991926]
- [ 0.52991926  0.8480481 ]],[[ 0.83867057 -0.54463904]
- [ 0.54463904  0.83867057]],[[ 0.82903757 -0.5591929 ]
- [ 0.5591929   0.82903757]],[[ 0.81915204 -0.57357644]
- [ 0.57357644  0.81915204]],[[ 0.80901699 -0.58778525]
- [ 0.58778525  0.80901699]],[[ 0.79863551 -0.60181502]
- [ 0.60181502  0.79863551]],[[ 0.78801075 -0.61566148]
- [ 0.61566148  0.78801075]],[[ 0.77714596 -0.62932039]
- [ 0.62932039  0.77714596]],[[ 0.76604444 -0.64278761]
- [ 0.64278761  0.76604444]],[[ 0.75470958 -0.65605903]
- [ 0.65605903  0.75470958]],[[ 0.74314483 -0.66913061]
- [ 0.66913061  0.74314483]],[[ 0.7313537  -0.68199836]
- [ 0.68199836  0.7313537 ]],[[ 0.7193398  -0.69465837]
- [ 0.69465837  0.7193398 ]],[[ 0.70710678 -0.70710678]
- [ 0.70710678  0.70710678]],[[ 0.69465837 -0.7193398 ]
- [ 0.7193398   0.69465837]],[[ 0.68199836 -0.7313537 ]
- [ 0.7313537   0.68199836]],[[ 0.66913061 -0.74314483]
- [ 0.74314483  0.66913061]],[[ 0.65605903 -0.75470958]
- [ 0.75470958  0.65605903]],[[ 0.64278761 -0.76604444]
- [ 0.76604444  0.64278761]],[[ 0.62932039 -0.77714596]
- [ 0.77714596  0.62932039]],[[ 0.61566148 -0.78801075]
- [ 0.78801075  0.61566148]],[[ 0.60181502 -0.79863551]
- [ 0.79863551  0.60181502]],[[ 0.58778525 -0.80901699]
- [ 0.80901699  0.58778525]],[[ 0.57357644 -0.81915204]
- [ 0.81915204  0.57357644]],[[ 0.5591929  -0.82903757]
- [ 0.82903757  0.5591929 ]],[[ 0.54463904 -0.83867057]
- [ 0.83867057  0.54463904]],[[ 0.52991926 -0.8480481 ]
- [ 0.8480481   0.52991926]],[[ 0.51503807 -0.8571673 ]
- [ 0.8571673   0.51503807]],[[ 0.5       -0.8660254]
- [ 0.8660254  0.5      ]],[[ 0.48480962 -0.87461971]
- [ 0.87461971  0.48480962]],[[ 0.46947156 -0.88294759]
- [ 0.88294759  0.46947156]],[[ 0.4539905  -0.89100652]
- [ 0.89100652  0.4539905 ]],[[ 0.43837115 -0.89879405]
- [ 0.89879405  0.43837115]],[[ 0.42261826 -0.90630779]
- [ 0.90630779  0.42261826]],[[ 0.40673664 -0.91354546]
- [ 0.91354546  0.40673664]],[[ 0.39073113 -0.92050485]
- [ 0.92050485  0.39073113]],[[ 0.37460659 -0.92718385]
- [ 0.92718385  0.37460659]],[[ 0.35836795 -0.93358043]
- [ 0.93358043  0.35836795]],[[ 0.34202014 -0.93969262]
- [ 0.93969262  0.34202014]],[[ 0.32556815 -0.94551858]
- [ 0.94551858  0.32556815]],[[ 0.30901699 -0.95105652]
- [ 0.95105652  0.30901699]],[[ 0.2923717  -0.95630476]
- [ 0.95630476  0.2923717 ]],[[ 0.27563736 -0.9612617 ]
- [ 0.9612617   0.27563736]],[[ 0.25881905 -0.96592583]
- [ 0.96592583  0.25881905]],[[ 0.2419219  -0.97029573]
- [ 0.97029573  0.2419219 ]],[[ 0.22495105 -0.97437006]
- [ 0.97437006  0.22495105]],[[ 0.20791169 -0.9781476 ]
- [ 0.9781476   0.20791169]],[[ 0.190809   -0.98162718]
- [ 0.98162718  0.190809  ]],[[ 0.17364818 -0.98480775]
- [ 0.98480775  0.17364818]],[[ 0.15643447 -0.98768834]
- [ 0.98768834  0.15643447]],[[ 0.1391731  -0.99026807]
- [ 0.99026807  0.1391731 ]],[[ 0.12186934 -0.99254615]
- [ 0.99254615  0.12186934]],[[ 0.10452846 -0.9945219 ]
- [ 0.9945219   0.10452846]],[[ 0.08715574 -0.9961947 ]
- [ 0.9961947   0.08715574]],[[ 0.06975647 -0.99756405]
- [ 0.99756405  0.06975647]],[[ 0.05233596 -0.99862953]
- [ 0.99862953  0.05233596]],[[ 0.0348995  -0.99939083]
- [ 0.99939083  0.0348995 ]],[[ 0.01745241 -0.9998477 ]
- [ 0.9998477   0.01745241]],[[ 6.123234e-17 -1.000000e+00]
- [ 1.000000e+00  6.123234e-17]],[[-0.01745241 -0.9998477 ]
- [ 0.9998477  -0.01745241]],[[-0.0348995  -0.99939083]
- [ 0.99939083 -0.0348995 ]],[[-0.05233596 -0.99862953]
- [ 0.99862953 -0.05233596]],[[-0.06975647 -0.99756405]
- [ 0.99756405 -0.06975647]],[[-0.08715574 -0.9961947 ]
- [ 0.9961947  -0.08715574]],[[-0.10452846 -0.9945219 ]
- [ 0.9945219  -0.10452846]],[[-0.12186934 -0.99254615]
- [ 0.99254615 -0.12186934]],[[-0.1391731  -0.99026807]
- [ 0.99026807 -0.1391731 ]],[[-0.15643447 -0.98768834]
- [ 0.98768834 -0.15643447]],[[-0.17364818 -0.98480775]
- [ 0.98480775 -0.17364818]],[[-0.190809   -0.98162718]
- [ 0.98162718 -0.190809  ]],[[-0.20791169 -0.9781476 ]
- [ 0.9781476  -0.20791169]],[[-0.22495105 -0.97437006]
- [ 0.97437006 -0.22495105]],[[-0.2419219  -0.97029573]
- [ 0.97029573 -0.2419219 ]],[[-0.25881905 -0.96592583]
- [ 0.96592583 -0.25881905]],[[-0.27563736 -0.9612617 ]
- [ 0.9612617  -0.27563736]],[[-0.2923717  -0.95630476]
- [ 0.95630476 -0.2923717 ]],[[-0.30901699 -0.95105652]
- [ 0.95105652 -0.30901699]],[[-0.32556815 -0.94551858]
- [ 0.94551858 -0.32556815]],[[-0.34202014 -0.93969262]
- [ 0.93969262 -0.34202014]],[[-0.35836795 -0.93358043]
- [ 0.93358043 -0.35836795]],[[-0.37460659 -0.92718385]
- [ 0.92718385 -0.37460659]],[[-0.39073113 -0.92050485]
- [ 0.92050485 -0.39073113]],[[-0.40673664 -0.91354546]
- [ 0.91354546 -0.40673664]],[[-0.42261826 -0.90630779]
- [ 0.90630779 -0.42261826]],[[-0.43837115 -0.89879405]
- [ 0.89879405 -0.43837115]],[[-0.4539905  -0.89100652]
- [ 0.89100652 -0.4539905 ]],[[-0.46947156 -0.88294759]
- [ 0.88294759 -0.46947156]],[[-0.48480962 -0.87461971]
- [ 0.87461971 -0.48480962]],[[-0.5       -0.8660254]
- [ 0.8660254 -0.5      ]],[[-0.51503807 -0.8571673 ]
- [ 0.8571673  -0.51503807]],[[-0.52991926 -0.8480481 ]
- [ 0.8480481  -0.52991926]],[[-0.54463904 -0.83867057]
- [ 0.83867057 -0.54463904]],[[-0.5591929  -0.82903757]
- [ 0.82903757 -0.5591929 ]],[[-0.57357644 -0.81915204]
- [ 0.81915204 -0.57357644]],[[-0.58778525 -0.80901699]
- [ 0.80901699 -0.58778525]],[[-0.60181502 -0.79863551]
- [ 0.79863551 -0.60181502]],[[-0.61566148 -0.78801075]
- [ 0.78801075 -0.61566148]],[[-0.62932039 -0.77714596]
- [ 0.77714596 -0.62932039]],[[-0.64278761 -0.76604444]
- [ 0.76604444 -0.64278761]],[[-0.65605903 -0.75470958]
- [ 0.75470958 -0.65605903]],[[-0.66913061 -0.74314483]
- [ 0.74314483 -0.66913061]],[[-0.68199836 -0.7313537 ]
- [ 0.7313537  -0.68199836]],[[-0.69465837 -0.7193398 ]
- [ 0.7193398  -0.69465837]],[[-0.70710678 -0.70710678]
- [ 0.70710678 -0.70710678]],[[-0.7193398  -0.69465837]
- [ 0.69465837 -0.7193398 ]],[[-0.7313537  -0.68199836]
- [ 0.68199836 -0.7313537 ]],[[-0.74314483 -0.66913061]
- [ 0.66913061 -0.74314483]],[[-0.75470958 -0.65605903]
- [ 0.65605903 -0.75470958]],[[-0.76604444 -0.64278761]
- [ 0.64278761 -0.76604444]],[[-0.77714596 -0.62932039]
- [ 0.62932039 -0.77714596]],[[-0.78801075 -0.61566148]
- [ 0.61566148 -0.78801075]],[[-0.79863551 -0.60181502]
- [ 0.60181502 -0.79863551]],[[-0.80901699 -0.58778525]
- [ 0.58778525 -0.80901699]],[[-0.81915204 -0.57357644]
- [ 0.57357644 -0.81915204]],[[-0.82903757 -0.5591929 ]
- [ 0.5591929  -0.82903757]],[[-0.83867057 -0.54463904]
- [ 0.54463904 -0.83867057]],[[-0.8480481  -0.52991926]
- [ 0.52991926 -0.8480481 ]],[[-0.8571673  -0.51503807]
- [ 0.51503807 -0.8571673 ]],[[-0.8660254 -0.5      ]
- [ 0.5       -0.8660254]],[[-0.87461971 -0.48480962]
- [ 0.48480962 -0.87461971]],[[-0.88294759 -0.46947156]
- [ 0.46947156 -0.88294759]],[[-0.89100652 -0.4539905 ]
- [ 0.4539905  -0.89100652]],[[-0.89879405 -0.43837115]
- [ 0.43837115 -0.89879405]],[[-0.90630779 -0.42261826]
- [ 0.42261826 -0.90630779]],[[-0.91354546 -0.40673664]
- [ 0.40673664 -0.91354546]],[[-0.92050485 -0.39073113]
- [ 0.39073113 -0.92050485]],[[-0.92718385 -0.37460659]
- [ 0.37460659 -0.92718385]],[[-0.93358043 -0.35836795]
- [ 0.35836795 -0.93358043]],[[-0.93969262 -0.34202014]
- [ 0.34202014 -0.93969262]],[[-0.94551858 -0.32556815]
- [ 0.32556815 -0.94551858]],[[-0.95105652 -0.30901699]
- [ 0.30901699 -0.95105652]],[[-0.95630476 -0.2923717 ]
- [ 0.2923717  -0.95630476]],[[-0.9612617  -0.27563736]
- [ 0.27563736 -0.9612617 ]],[[-0.96592583 -0.25881905]
- [ 0.25881905 -0.96592583]],[[-0.97029573 -0.2419219 ]
- [ 0.2419219  -0.97029573]],[[-0.97437006 -0.22495105]
- [ 0.22495105 -0.97437006]],[[-0.9781476  -0.20791169]
- [ 0.20791169 -0.9781476 ]],[[-0.98162718 -0.190809  ]
- [ 0.190809   -0.98162718]],[[-0.98480775 -0.17364818]
- [ 0.17364818 -0.98480775]],[[-0.98768834 -0.15643447]
- [ 0.15643447 -0.98768834]],[[-0.99026807 -0.1391731 ]
- [ 0.1391731  -0.99026807]],[[-0.99254615 -0.12186934]
- [ 0.12186934 -0.99254615]],[[-0.9945219  -0.10452846]
- [ 0.10452846 -0.9945219 ]],[[-0.9961947  -0.08715574]
- [ 0.08715574 -0.9961947 ]],[[-0.99756405 -0.06975647]
- [ 0.06975647 -0.99756405]],[[-0.99862953 -0.05233596]
- [ 0.05233596 -0.99862953]],[[-0.99939083 -0.0348995 ]
- [ 0.0348995  -0.99939083]],[[-0.9998477  -0.01745241]
- [ 0.01745241 -0.9998477 ]],[[-1.0000000e+00 -1.2246468e-16]
- [ 1.2246468e-16 -1.0000000e+00]],[[-0.9998477   0.01745241]
- [-0.01745241 -0.9998477 ]],[[-0.99939083  0.0348995 ]
- [-0.0348995  -0.99939083]],[[-0.99862953  0.05233596]
- [-0.05233596 -0.99862953]],[[-0.99756405  0.06975647]
- [-0.06975647 -0.99756405]],[[-0.9961947   0.08715574]
- [-0.08715574 -0.9961947 ]],[[-0.9945219   0.10452846]
- [-0.10452846 -0.9945219 ]],[[-0.99254615  0.12186934]
- [-0.12186934 -0.99254615]],[[-0.99026807  0.1391731 ]
- [-0.1391731  -0.99026807]],[[-0.98768834  0.15643447]
- [-0.15643447 -0.98768834]],[[-0.98480775  0.17364818]
- [-0.17364818 -0.98480775]],[[-0.98162718  0.190809  ]
- [-0.190809   -0.98162718]],[[-0.9781476   0.20791169]
- [-0.20791169 -0.9781476 ]],[[-0.97437006  0.22495105]
- [-0.22495105 -0.97437006]],[[-0.97029573  0.2419219 ]
- [-0.2419219  -0.97029573]],[[-0.96592583  0.25881905]
- [-0.25881905 -0.96592583]],[[-0.9612617   0.27563736]
- [-0.27563736 -0.9612617 ]],[[-0.95630476  0.2923717 ]
- [-0.2923717  -0.95630476]],[[-0.95105652  0.30901699]
- [-0.30901699 -0.95105652]],[[-0.94551858  0.32556815]
- [-0.32556815 -0.94551858]],[[-0.93969262  0.34202014]
- [-0.34202014 -0.93969262]],[[-0.93358043  0.35836795]
- [-0.35836795 -0.93358043]],[[-0.92718385  0.37460659]
- [-0.37460659 -0.92718385]],[[-0.92050485  0.39073113]
- [-0.39073113 -0.92050485]],[[-0.91354546  0.40673664]
- [-0.40673664 -0.91354546]],[[-0.90630779  0.42261826]
- [-0.42261826 -0.90630779]],[[-0.89879405  0.43837115]
- [-0.43837115 -0.89879405]],[[-0.89100652  0.4539905 ]
- [-0.4539905  -0.89100652]],[[-0.88294759  0.46947156]
- [-0.46947156 -0.88294759]],[[-0.87461971  0.48480962]
- [-0.48480962 -0.87461971]],[[-0.8660254  0.5      ]
- [-0.5       -0.8660254]],[[-0.8571673   0.51503807]
- [-0.51503807 -0.8571673 ]],[[-0.8480481   0.52991926]
- [-0.52991926 -0.8480481 ]],[[-0.83867057  0.54463904]
- [-0.54463904 -0.83867057]],[[-0.82903757  0.5591929 ]
- [-0.5591929  -0.82903757]],[[-0.81915204  0.57357644]
- [-0.57357644 -0.81915204]],[[-0.80901699  0.58778525]
- [-0.58778525 -0.80901699]],[[-0.79863551  0.60181502]
- [-0.60181502 -0.79863551]],[[-0.78801075  0.61566148]
- [-0.61566148 -0.78801075]],[[-0.77714596  0.62932039]
- [-0.62932039 -0.77714596]],[[-0.76604444  0.64278761]
- [-0.64278761 -0.76604444]],[[-0.75470958  0.65605903]
- [-0.65605903 -0.75470958]],[[-0.74314483  0.66913061]
- [-0.66913061 -0.74314483]],[[-0.7313537   0.68199836]
- [-0.68199836 -0.7313537 ]],[[-0.7193398   0.69465837]
- [-0.69465837 -0.7193398 ]],[[-0.70710678  0.70710678]
- [-0.70710678 -0.70710678]],[[-0.69465837  0.7193398 ]
- [-0.7193398  -0.69465837]],[[-0.68199836  0.7313537 ]
- [-0.7313537  -0.68199836]],[[-0.66913061  0.74314483]
- [-0.74314483 -0.66913061]],[[-0.65605903  0.75470958]
- [-0.75470958 -0.65605903]],[[-0.64278761  0.76604444]
- [-0.76604444 -0.64278761]],[[-0.62932039  0.77714596]
- [-0.77714596 -0.62932039]],[[-0.61566148  0.78801075]
- [-0.78801075 -0.61566148]],[[-0.60181502  0.79863551]
- [-0.79863551 -0.60181502]],[[-0.58778525  0.80901699]
- [-0.80901699 -0.58778525]],[[-0.57357644  0.81915204]
- [-0.81915204 -0.57357644]],[[-0.5591929   0.82903757]
- [-0.82903757 -0.5591929 ]],[[-0.54463904  0.83867057]
- [-0.83867057 -0.54463904]],[[-0.52991926  0.8480481 ]
- [-0.8480481  -0.52991926]],[[-0.51503807  0.8571673 ]
- [-0.8571673  -0.51503807]],[[-0.5        0.8660254]
- [-0.8660254 -0.5      ]],[[-0.48480962  0.87461971]
- [-0.87461971 -0.48480962]],[[-0.46947156  0.88294759]
- [-0.88294759 -0.46947156]],[[-0.4539905   0.89100652]
- [-0.89100652 -0.4539905 ]],[[-0.43837115  0.89879405]
- [-0.89879405 -0.43837115]],[[-0.42261826  0.90630779]
- [-0.90630779 -0.42261826]],[[-0.40673664  0.91354546]
- [-0.91354546 -0.40673664]],[[-0.39073113  0.92050485]
- [-0.92050485 -0.39073113]],[[-0.37460659  0.92718385]
- [-0.92718385 -0.37460659]],[[-0.35836795  0.93358043]
- [-0.93358043 -0.35836795]],[[-0.34202014  0.93969262]
- [-0.93969262 -0.34202014]],[[-0.32556815  0.94551858]
- [-0.94551858 -0.32556815]],[[-0.30901699  0.95105652]
- [-0.95105652 -0.30901699]],[[-0.2923717   0.95630476]
- [-0.95630476 -0.2923717 ]],[[-0.27563736  0.9612617 ]
- [-0.9612617  -0.27563736]],[[-0.25881905  0.96592583]
- [-0.96592583 -0.25881905]],[[-0.2419219   0.97029573]
- [-0.97029573 -0.2419219 ]],[[-0.22495105  0.97437006]
- [-0.97437006 -0.22495105]],[[-0.20791169  0.9781476 ]
- [-0.9781476  -0.20791169]],[[-0.190809    0.98162718]
- [-0.98162718 -0.190809  ]],[[-0.17364818  0.98480775]
- [-0.98480775 -0.17364818]],[[-0.15643447  0.98768834]
- [-0.98768834 -0.15643447]],[[-0.1391731   0.99026807]
- [-0.99026807 -0.1391731 ]],[[-0.12186934  0.99254615]
- [-0.99254615 -0.12186934]],[[-0.10452846  0.9945219 ]
- [-0.9945219  -0.10452846]],[[-0.08715574  0.9961947 ]
- [-0.9961947  -0.08715574]],[[-0.06975647  0.99756405]
- [-0.99756405 -0.06975647]],[[-0.05233596  0.99862953]
- [-0.99862953 -0.05233596]],[[-0.0348995   0.99939083]
- [-0.99939083 -0.0348995 ]],[[-0.01745241  0.9998477 ]
- [-0.9998477  -0.01745241]],[[-1.8369702e-16  1.0000000e+00]
- [-1.0000000e+00 -1.8369702e-16]],[[ 0.01745241  0.9998477 ]
- [-0.9998477   0.01745241]],[[ 0.0348995   0.99939083]
- [-0.99939083  0.0348995 ]],[[ 0.05233596  0.99862953]
- [-0.99862953  0.05233596]],[[ 0.06975647  0.99756405]
- [-0.99756405  0.06975647]],[[ 0.08715574  0.9961947 ]
- [-0.9961947   0.08715574]],[[ 0.10452846  0.9945219 ]
- [-0.9945219   0.10452846]],[[ 0.12186934  0.99254615]
- [-0.99254615  0.12186934]],[[ 0.1391731   0.99026807]
- [-0.99026807  0.1391731 ]],[[ 0.15643447  0.98768834]
- [-0.98768834  0.15643447]],[[ 0.17364818  0.98480775]
- [-0.98480775  0.17364818]],[[ 0.190809    0.98162718]
- [-0.98162718  0.190809  ]],[[ 0.20791169  0.9781476 ]
- [-0.9781476   0.20791169]],[[ 0.22495105  0.97437006]
- [-0.97437006  0.22495105]],[[ 0.2419219   0.97029573]
- [-0.97029573  0.2419219 ]],[[ 0.25881905  0.96592583]
- [-0.96592583  0.25881905]],[[ 0.27563736  0.9612617 ]
- [-0.9612617   0.27563736]],[[ 0.2923717   0.95630476]
- [-0.95630476  0.2923717 ]],[[ 0.30901699  0.95105652]
- [-0.95105652  0.30901699]],[[ 0.32556815  0.94551858]
- [-0.94551858  0.32556815]],[[ 0.34202014  0.93969262]
- [-0.93969262  0.34202014]],[[ 0.35836795  0.93358043]
- [-0.93358043  0.35836795]],[[ 0.37460659  0.92718385]
- [-0.92718385  0.37460659]],[[ 0.39073113  0.92050485]
- [-0.92050485  0.39073113]],[[ 0.40673664  0.91354546]
- [-0.91354546  0.40673664]],[[ 0.42261826  0.90630779]
- [-0.90630779  0.42261826]],[[ 0.43837115  0.89879405]
- [-0.89879405  0.43837115]],[[ 0.4539905   0.89100652]
- [-0.89100652  0.4539905 ]],[[ 0.46947156  0.88294759]
- [-0.88294759  0.46947156]],[[ 0.48480962  0.87461971]
- [-0.87461971  0.48480962]],[[ 0.5        0.8660254]
- [-0.8660254  0.5      ]],[[ 0.51503807  0.8571673 ]
- [-0.8571673   0.51503807]],[[ 0.52991926  0.8480481 ]
- [-0.8480481   0.52991926]],[[ 0.54463904  0.83867057]
- [-0.83867057  0.54463904]],[[ 0.5591929   0.82903757]
- [-0.82903757  0.5591929 ]],[[ 0.57357644  0.81915204]
- [-0.81915204  0.57357644]],[[ 0.58778525  0.80901699]
- [-0.80901699  0.58778525]],[[ 0.60181502  0.79863551]
- [-0.79863551  0.60181502]],[[ 0.61566148  0.78801075]
- [-0.78801075  0.61566148]],[[ 0.62932039  0.77714596]
- [-0.77714596  0.62932039]],[[ 0.64278761  0.76604444]
- [-0.76604444  0.64278761]],[[ 0.65605903  0.75470958]
- [-0.75470958  0.65605903]],[[ 0.66913061  0.74314483]
- [-0.74314483  0.66913061]],[[ 0.68199836  0.7313537 ]
- [-0.7313537   0.68199836]],[[ 0.69465837  0.7193398 ]
- [-0.7193398   0.69465837]],[[ 0.70710678  0.70710678]
- [-0.70710678  0.70710678]],[[ 0.7193398   0.69465837]
- [-0.69465837  0.7193398 ]],[[ 0.7313537   0.68199836]
- [-0.68199836  0.7313537 ]],[[ 0.74314483  0.66913061]
- [-0.66913061  0.74314483]],[[ 0.75470958  0.65605903]
- [-0.65605903  0.75470958]],[[ 0.76604444  0.64278761]
- [-0.64278761  0.76604444]],[[ 0.77714596  0.62932039]
- [-0.62932039  0.77714596]],[[ 0.78801075  0.61566148]
- [-0.61566148  0.78801075]],[[ 0.79863551  0.60181502]
- [-0.60181502  0.79863551]],[[ 0.80901699  0.58778525]
- [-0.58778525  0.80901699]],[[ 0.81915204  0.57357644]
- [-0.57357644  0.81915204]],[[ 0.82903757  0.5591929 ]
- [-0.5591929   0.82903757]],[[ 0.83867057  0.54463904]
- [-0.54463904  0.83867057]],[[ 0.8480481   0.52991926]
- [-0.52991926  0.8480481 ]],[[ 0.8571673   0.51503807]
- [-0.51503807  0.8571673 ]],[[ 0.8660254  0.5      ]
- [-0.5        0.8660254]],[[ 0.87461971  0.48480962]
- [-0.48480962  0.87461971]],[[ 0.88294759  0.46947156]
- [-0.46947156  0.88294759]],[[ 0.89100652  0.4539905 ]
- [-0.4539905   0.89100652]],[[ 0.89879405  0.43837115]
- [-0.43837115  0.89879405]],[[ 0.90630779  0.42261826]
- [-0.42261826  0.90630779]],[[ 0.91354546  0.40673664]
- [-0.40673664  0.91354546]],[[ 0.92050485  0.39073113]
- [-0.39073113  0.92050485]],[[ 0.92718385  0.37460659]
- [-0.37460659  0.92718385]],[[ 0.93358043  0.35836795]
- [-0.35836795  0.93358043]],[[ 0.93969262  0.34202014]
- [-0.34202014  0.93969262]],[[ 0.94551858  0.32556815]
- [-0.32556815  0.94551858]],[[ 0.95105652  0.30901699]
- [-0.30901699  0.95105652]],[[ 0.95630476  0.2923717 ]
- [-0.2923717   0.95630476]],[[ 0.9612617   0.27563736]
- [-0.27563736  0.9612617 ]],[[ 0.96592583  0.25881905]
- [-0.25881905  0.96592583]],[[ 0.97029573  0.2419219 ]
- [-0.2419219   0.97029573]],[[ 0.97437006  0.22495105]
- [-0.22495105  0.97437006]],[[ 0.9781476   0.20791169]
- [-0.20791169  0.9781476 ]],[[ 0.98162718  0.190809  ]
- [-0.190809    0.98162718]],[[ 0.98480775  0.17364818]
- [-0.17364818  0.98480775]],[[ 0.98768834  0.15643447]
- [-0.15643447  0.98768834]],[[ 0.99026807  0.1391731 ]
- [-0.1391731   0.99026807]],[[ 0.99254615  0.12186934]
- [-0.12186934  0.99254615]],[[ 0.9945219   0.10452846]
- [-0.10452846  0.9945219 ]],[[ 0.9961947   0.08715574]
- [-0.08715574  0.9961947 ]],[[ 0.99756405  0.06975647]
- [-0.06975647  0.99756405]],[[ 0.99862953  0.05233596]
- [-0.05233596  0.99862953]],[[ 0.99939083  0.0348995 ]
- [-0.0348995   0.99939083]],[[ 0.9998477   0.01745241]
- [-0.01745241  0.9998477 ]],
\ No newline at end of file
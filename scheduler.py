@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class FrameScheduler:
+    """Keep frames within a time budget by staggering steering updates.
+
+    While frames fit the budget every actor steers every frame (k = 1).
+    When the smoothed frame time runs over target_ms, k is raised and only
+    every k-th actor, a different 1/k of the flock each frame, computes its
+    steering, scaled by k to make up for the frames it skips (see
+    FlockState.step); the others keep flying on their current velocity. k is
+    lowered again once frames are comfortably under budget, below headroom
+    times the target. k changes by one at most every cooldown frames so
+    that each change gets time to show in the smoothed frame time.
+
+    """
+
+    def __init__(self, target_ms, max_k=16, headroom=0.8, smoothing=0.1,
+                 cooldown=10):
+        self.target_ms = target_ms
+        self.max_k = max_k
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.k = 1
+        self.offset = 0
+        self.frame_ms = None
+        self._wait = cooldown
+
+    def rows(self, n):
+        """The actors to steer this frame, or None for all of them."""
+        if self.k == 1:
+            return None
+        return np.arange(self.offset, n, self.k)
+
+    def end_frame(self, frame_ms):
+        """Account for a frame that took frame_ms and adapt k."""
+        if self.frame_ms is None:
+            self.frame_ms = frame_ms
+        else:
+            self.frame_ms += self.smoothing * (frame_ms - self.frame_ms)
+        self.offset = (self.offset + 1) % self.k
+
+        self._wait -= 1
+        if self._wait > 0:
+            return
+        if self.frame_ms > self.target_ms and self.k < self.max_k:
+            self.k += 1
+        elif self.frame_ms < self.headroom * self.target_ms and self.k > 1:
+            self.k -= 1
+        else:
+            return
+        self.offset %= self.k
+        self._wait = self.cooldown
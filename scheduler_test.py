@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from flock import FlockState
+from scheduler import FrameScheduler
+from spatial_hash import SpatialHash
+
+
+def velocity_change(k, steps=1):
+    """How far the flock's velocities move over steps cycles of k frames.
+
+    The steps are a millisecond long, so the steering forces hardly change
+    over a cycle and every actor should gain the same velocity whether it
+    steers every frame or every k-th one.
+
+    """
+    state = FlockState.random(600, 4, index=SpatialHash)
+    start = state.velocities.copy()
+    scheduler = FrameScheduler(target_ms=1, cooldown=10**6)
+    scheduler.k = k
+    for _ in range(k * steps):
+        state.step(1, rows=scheduler.rows(len(state)), stagger=scheduler.k)
+        scheduler.end_frame(0)
+    return state.velocities - start
+
+
+@pytest.mark.parametrize("k", [2, 3, 5])
+def test_staggered_steering_matches_every_frame(k):
+    every = velocity_change(1, k)
+    staggered = velocity_change(k)
+    ratio = np.abs(staggered).sum() / np.abs(every).sum()
+    assert ratio == pytest.approx(1, abs=0.02)
+    # A few actors see a neighbor come or go within the cycle.
+    close = np.isclose(staggered, every, rtol=0.05, atol=1e-3).all(axis=1)
+    assert close.mean() > 0.9
@@ -0,0 +1,262 @@
+import heapq
+import math
+
+import numpy as np
+
+from quadtree import FlatQuadTree, Point
+from spatial_index import (ArrayIndex, concat_ranges, neighbor_lists,
+                           pair_lists)
+
+
+class SpatialHash(ArrayIndex):
+    """A uniform grid of square cells over the points.
+
+    With cell_size equal to the query radius every query_radius call scans
+    the 3x3 block of cells around the centre and never descends a tree.
+
+    The grid is stored flat: the points are grouped by cell, so the points
+    of cell c are xs[start[c]:start[c+1]], with cells numbered row by row
+    from the top-left corner (west, north) of the grid. Points added with
+    insert() are kept aside and the grid is rebuilt on the next query.
+
+    """
+
+    def __init__(self, cell_size=75):
+        self.cell_size = cell_size
+        self.pending = []
+        self._set_points(np.zeros(0), np.zeros(0), None)
+
+    @classmethod
+    def from_arrays(cls, xs, ys, payloads=None, cell_size=75):
+        index = cls(cell_size)
+        index._set_points(np.asarray(xs, dtype=np.float64),
+                          np.asarray(ys, dtype=np.float64), payloads)
+        return index
+
+    def _set_points(self, xs, ys, payloads):
+        self._xs_in, self._ys_in = xs, ys
+        self.payloads = payloads
+        self._build()
+
+    def _build(self):
+        """Lay the points out cell by cell.
+
+        The cell starts come from a counting pass over the cell numbers;
+        a stable sort by cell then groups the points.
+
+        """
+        xs, ys = self._xs_in, self._ys_in
+        size = self.cell_size
+        self.west = xs.min() if len(xs) else 0.0
+        self.north = ys.min() if len(ys) else 0.0
+        col = ((xs - self.west) // size).astype(np.intp)
+        row = ((ys - self.north) // size).astype(np.intp)
+        self.cols = int(col.max()) + 1 if len(xs) else 1
+        self.rows = int(row.max()) + 1 if len(ys) else 1
+        cell = row * self.cols + col
+        counts = np.bincount(cell, minlength=self.rows * self.cols)
+        self.start = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=self.start[1:])
+        self.order = np.argsort(cell, kind='stable')
+        self.cell = cell[self.order]
+        self.xs = xs[self.order]
+        self.ys = ys[self.order]
+        self._lists = None
+        self._tree = None
+
+    def insert(self, point):
+        """Add Point point to the grid; always succeeds."""
+        self.pending.append(point)
+        return True
+
+    def __len__(self):
+        return len(self.xs) + len(self.pending)
+
+    def _prepare(self):
+        """Return the grid as Python lists, which single queries walk."""
+        self._flush()
+        if self._lists is None:
+            self._lists = (self.start.tolist(), self.xs.tolist(),
+                           self.ys.tolist(), self.order.tolist())
+        return self._lists
+
+    def _candidates(self, start, west, north, east, south):
+        """Yield the grouped-point indices in the cells touching the box."""
+        size = self.cell_size
+        c0 = int((west - self.west) // size)
+        c1 = int((east - self.west) // size)
+        r0 = int((north - self.north) // size)
+        r1 = int((south - self.north) // size)
+        if c0 >= self.cols or r0 >= self.rows or c1 < 0 or r1 < 0:
+            # The box lies wholly beside the grid.
+            return
+        c0, c1 = max(c0, 0), min(c1, self.cols - 1)
+        r0, r1 = max(r0, 0), min(r1, self.rows - 1)
+        for r in range(r0, r1 + 1):
+            # The cells c0..c1 of a row are consecutive in the grid.
+            base = r * self.cols
+            yield from range(start[base + c0], start[base + c1 + 1])
+
+    def query(self, boundary, found_points):
+        """Find the points in the grid that lie within boundary."""
+        start, xs, ys, order = self._prepare()
+        for i in self._candidates(start, boundary.west_edge,
+                                  boundary.north_edge, boundary.east_edge,
+                                  boundary.south_edge):
+            if boundary.contains((xs[i], ys[i])):
+                found_points.append(Point(xs[i], ys[i],
+                                          self._payload(order[i])))
+        return found_points
+
+    def query_radius(self, centre, radius, found_payloads):
+        """Find the payloads of the points within radius of centre."""
+        start, xs, ys, order = self._prepare()
+        cx, cy = centre
+        r2 = radius**2
+        for i in self._candidates(start, cx - radius, cy - radius,
+                                  cx + radius, cy + radius):
+            if (xs[i] - cx)**2 + (ys[i] - cy)**2 <= r2:
+                found_payloads.append(self._payload(order[i]))
+        return found_payloads
+
+    def query_knn(self, centre, k, max_radius=math.inf):
+        """Find the payloads of the k points nearest to centre.
+
+        Cells are scanned in square rings around the centre's cell. Points
+        nearer than ring * cell_size are closer than anything in the rings
+        not yet scanned, so they are confirmed nearest-first from a heap and
+        the search stops once k are confirmed.
+
+        """
+        start, xs, ys, order = self._prepare()
+        cx, cy = centre
+        size = self.cell_size
+        col = int((cx - self.west) // size)
+        row = int((cy - self.north) // size)
+        heap = []
+        found = []
+        ring = 0
+        while True:
+            for r, c0, c1 in self._ring(row, col, ring):
+                base = r * self.cols
+                for i in range(start[base + c0], start[base + c1 + 1]):
+                    heapq.heappush(heap, ((xs[i] - cx)**2 + (ys[i] - cy)**2,
+                                          i))
+            everything = (col - ring <= 0 and col + ring >= self.cols - 1 and
+                          row - ring <= 0 and row + ring >= self.rows - 1)
+            limit = max_radius if everything else min(ring * size, max_radius)
+            while heap and len(found) < k and heap[0][0] <= limit**2:
+                found.append(self._payload(order[heapq.heappop(heap)[1]]))
+            if len(found) == k or everything or ring * size >= max_radius:
+                return found
+            ring += 1
+
+    def _ring(self, row, col, ring):
+        """Yield (row, c0, c1) runs of the cells ring cells from (row, col)."""
+        c0, c1 = max(col - ring, 0), min(col + ring, self.cols - 1)
+        if c0 > c1:
+            return
+        for r in (row - ring, row + ring) if ring else (row,):
+            if 0 <= r < self.rows:
+                yield r, c0, c1
+        for c in (col - ring, col + ring) if ring else ():
+            if 0 <= c < self.cols:
+                for r in range(max(row - ring + 1, 0),
+                               min(row + ring - 1, self.rows - 1) + 1):
+                    yield r, c, c
+
+    def query_knn_many(self, centres, k, max_radius=math.inf):
+        """Find the k points nearest to every centre in one pass.
+
+        However many points crowd into a cell, a query has to measure them
+        all, so these queries go to a FlatQuadTree over the same points,
+        whose leaves split until they are small.
+
+        """
+        self._flush()
+        if self._tree is None:
+            self._tree = FlatQuadTree(self.xs, self.ys)
+        offsets, indices = self._tree.query_knn_many(centres, k, max_radius)
+        return offsets, self.order[indices]
+
+    @property
+    def candidates(self):
+        """How many points the last query_knn_many measured."""
+        return 0 if self._tree is None else self._tree.candidates
+
+    def query_radius_many(self, centres, radius, return_distances=False):
+        """Find the points within radius of every centre in one pass.
+
+        Each centre contributes one range of grouped points per grid row its
+        search square covers; all ranges are expanded and distance-tested
+        together.
+
+        """
+        self._flush()
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        m = len(centres)
+        size = self.cell_size
+        cx, cy = centres[:, 0], centres[:, 1]
+        c0 = np.maximum((cx - radius - self.west) // size, 0).astype(np.intp)
+        c1 = np.minimum((cx + radius - self.west) // size,
+                        self.cols - 1).astype(np.intp)
+        r0 = np.maximum((cy - radius - self.north) // size, 0).astype(np.intp)
+        r1 = np.minimum((cy + radius - self.north) // size,
+                        self.rows - 1).astype(np.intp)
+
+        span = int(2 * radius // size) + 2
+        query = np.repeat(np.arange(m), span)
+        row = (r0[:, None] + np.arange(span)).ravel()
+        valid = (row <= r1[query]) & (c0[query] <= c1[query])
+        query, row = query[valid], row[valid]
+        base = row * self.cols
+        starts = self.start[base + c0[query]]
+        ends = self.start[base + c1[query] + 1]
+
+        idx = concat_ranges(starts, ends)
+        query = np.repeat(query, ends - starts)
+        dx = self.xs[idx] - cx[query]
+        dy = self.ys[idx] - cy[query]
+        d2 = dx*dx + dy*dy
+        keep = d2 <= radius**2
+        return neighbor_lists(query[keep], self.order[idx[keep]], d2[keep],
+                              m, return_distances)
+
+    def query_pairs(self, radius, return_distances=False):
+        """Find every pair of points within radius of each other.
+
+        Each point is only tested against the points after it in grid
+        order that could be in range: the rest of its own grid row's span
+        and the grid rows below it, so every pair is measured once.
+
+        """
+        self._flush()
+        size = self.cell_size
+        reach = int(math.ceil(radius / size))
+        row, col = np.divmod(self.cell, self.cols)
+        c0 = np.maximum(col - reach, 0)
+        c1 = np.minimum(col + reach, self.cols - 1)
+        own = np.arange(len(self.xs))
+
+        # On its own grid row, a point's span starts right after it.
+        starts = [own + 1]
+        ends = [self.start[row * self.cols + c1 + 1]]
+        points = [own]
+        for dr in range(1, reach + 1):
+            below = row + dr < self.rows
+            base = (row[below] + dr) * self.cols
+            starts.append(self.start[base + c0[below]])
+            ends.append(self.start[base + c1[below] + 1])
+            points.append(own[below])
+        starts = np.concatenate(starts)
+        ends = np.concatenate(ends)
+        points = np.concatenate(points)
+
+        idx = concat_ranges(starts, ends)
+        points = np.repeat(points, ends - starts)
+        dx = self.xs[idx] - self.xs[points]
+        dy = self.ys[idx] - self.ys[points]
+        d2 = dx*dx + dy*dy
+        keep = d2 <= radius**2
+        return pair_lists(self.order[points[keep]], self.order[idx[keep]],
+                          d2[keep], return_distances)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from quadtree import Rect
+from spatial_hash import SpatialHash
+
+
+def make_hash():
+    rng = np.random.default_rng(3)
+    return SpatialHash.from_arrays(rng.uniform(0, 1920, 200),
+                                   rng.uniform(0, 1080, 200))
+
+
+def test_query_radius_beside_the_grid():
+    index = make_hash()
+    for centre in [(2200, 500), (2200, 1060), (2400, 1075), (900, 1400),
+                   (2200, 1400), (-300, -300)]:
+        assert index.query_radius(centre, 75, []) == []
+
+
+def test_query_box_beside_the_grid():
+    index = make_hash()
+    for centre in [(2200, 500), (2300, 1070), (900, 1400), (-300, 500)]:
+        assert index.query(Rect(*centre, 100, 100), []) == []
+
+
+def test_query_radius_over_the_edge():
+    index = make_hash()
+    centre = (1950, 1050)
+    expected = [i for i, (x, y) in enumerate(zip(index._xs_in, index._ys_in))
+                if (x - centre[0])**2 + (y - centre[1])**2 <= 150**2]
+    assert sorted(index.query_radius(centre, 150, [])) == expected
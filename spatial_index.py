@@ -0,0 +1,172 @@
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class SpatialIndex(ABC):
+    """The interface shared by the spatial indexes the flock can query.
+
+    An index can be filled one Point at a time with insert() or built in
+    one go from coordinate arrays with from_arrays(). Queries return the
+    payloads of the points they find; indexes built from arrays without
+    payloads use each point's position in those arrays instead. Every
+    method but query_knn_many is abstract, so an index missing one cannot
+    be instantiated.
+
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_arrays(cls, xs, ys, payloads=None):
+        """Build an index over the points (xs, ys) in one go."""
+
+    @abstractmethod
+    def insert(self, point):
+        """Add Point point to the index."""
+
+    @abstractmethod
+    def query(self, boundary, found_points):
+        """Find the points that lie within the Rect boundary."""
+
+    @abstractmethod
+    def query_radius(self, centre, radius, found_payloads):
+        """Find the payloads of the points within radius of centre."""
+
+    @abstractmethod
+    def query_knn(self, centre, k, max_radius=math.inf):
+        """Find the payloads of the k points nearest to centre.
+
+        Only points within max_radius count. The payloads are returned
+        nearest first; the search stops as soon as k points are known to
+        be nearer than anything left unvisited.
+
+        """
+
+    def query_knn_many(self, centres, k, max_radius=math.inf):
+        """Find the k points nearest to each of the (M, 2) centres.
+
+        Only points within max_radius count. Returns (offsets, indices) as
+        query_radius_many does, each row nearest first. This version runs
+        query_knn once per centre; indexes override it with one pass.
+
+        """
+        centres = np.asarray(centres, dtype=np.float64).reshape(-1, 2)
+        found = [self.query_knn(centre, k, max_radius)
+                 for centre in centres.tolist()]
+        offsets = np.zeros(len(found) + 1, dtype=np.intp)
+        np.cumsum([len(row) for row in found], out=offsets[1:])
+        indices = np.fromiter((i for row in found for i in row),
+                              dtype=np.intp, count=offsets[-1])
+        return offsets, indices
+
+    @abstractmethod
+    def query_radius_many(self, centres, radius, return_distances=False):
+        """Find the points within radius of each of the (M, 2) centres.
+
+        Returns (offsets, indices) in compressed sparse row form: the
+        points near centres[i] are indices[offsets[i]:offsets[i+1]], given
+        as positions in the arrays the index was built from. With
+        return_distances the matching squared distances follow as a third
+        array.
+
+        """
+
+    @abstractmethod
+    def query_pairs(self, radius, return_distances=False):
+        """Find every pair of indexed points no further apart than radius.
+
+        Returns (first, second) arrays of positions in the arrays the index
+        was built from, with first < second, so each unordered pair comes
+        up once. With return_distances their squared distances follow as a
+        third array.
+
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """Return the number of points in the index."""
+
+
+class ArrayIndex(SpatialIndex):
+    """A SpatialIndex laid out over coordinate arrays.
+
+    _set_points() builds the index over (xs, ys) and keeps them, with
+    their payloads, as _xs_in, _ys_in and payloads. Points added with
+    insert() wait in pending, and _flush() rebuilds the index with them
+    before the next query.
+
+    """
+
+    @abstractmethod
+    def _set_points(self, xs, ys, payloads):
+        """Build the index over the points (xs, ys) and their payloads."""
+
+    def _flush(self):
+        """Rebuild the index with the points added with insert()."""
+        if not self.pending:
+            return
+        points, self.pending = self.pending, []
+        if self.payloads is None:
+            payloads = list(range(len(self._xs_in)))
+        else:
+            payloads = list(self.payloads)
+        payloads.extend(point.payload for point in points)
+        self._set_points(
+            np.append(self._xs_in, [point.x for point in points]),
+            np.append(self._ys_in, [point.y for point in points]),
+            payloads)
+
+    def _payload(self, i):
+        return i if self.payloads is None else self.payloads[i]
+
+
+def concat_ranges(starts, ends):
+    """Concatenate np.arange(s, e) for every pair of starts and ends."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.intp)
+    nonempty = lengths > 0
+    starts, ends = starts[nonempty], ends[nonempty]
+    # Step by one everywhere except at the first element of each range,
+    # which jumps from the end of the previous range to its own start.
+    steps = np.ones(total, dtype=np.intp)
+    firsts = np.cumsum(lengths[nonempty]) - lengths[nonempty]
+    steps[firsts] = starts - np.concatenate(([1], ends[:-1])) + 1
+    steps[0] = starts[0]
+    return np.cumsum(steps)
+
+
+def neighbor_lists(rows, cols, d2, n, return_distances):
+    """Pack (row, col, d2) matches sorted by row into offsets and indices."""
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+    if return_distances:
+        return offsets, cols, d2
+    return offsets, cols
+
+
+def pair_lists(first, second, d2, return_distances):
+    """Order each (first, second) pair of point ids so that first < second."""
+    first, second = np.minimum(first, second), np.maximum(first, second)
+    if return_distances:
+        return first, second, d2
+    return first, second
+
+
+def nearest_lists(rows, cols, d2, n, k):
+    """Keep the k nearest (row, col, d2) matches of each of n rows.
+
+    Returns (offsets, indices) as neighbor_lists does, each row nearest
+    first.
+
+    """
+    order = np.lexsort((d2, rows))
+    rows, cols = rows[order], cols[order]
+    counts = np.bincount(rows, minlength=n)
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    keep = np.arange(len(rows)) - offsets[rows] < k
+    np.cumsum(np.minimum(counts, k), out=offsets[1:])
+    return offsets, cols[keep]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from quadtree import FlatQuadTree, Point, QuadTree, Rect
+from spatial_hash import SpatialHash
+from spatial_index import SpatialIndex
+
+
+def points(n=600, seed=4):
+    """Clumped points, some coincident, a few outside the 1920x1080 world."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(0, 1920, (6, 2))
+    pos = centres[rng.integers(6, size=n)] + rng.normal(0, 40, (n, 2))
+    pos[:20] = pos[20:40]
+    return pos
+
+
+def brute_pairs(pos, radius):
+    """Every (i, j, d2) with i < j and |pos[i] - pos[j]| <= radius."""
+    delta = pos[None, :, :] - pos[:, None, :]
+    d2 = np.einsum('ijk,ijk->ij', delta, delta)
+    first, second = np.nonzero(np.triu(d2 <= radius**2, k=1))
+    return first, second, d2[first, second]
+
+
+def inserted(pos):
+    tree = QuadTree(Rect(960, 540, 2400, 1600))
+    for i, (x, y) in enumerate(pos.tolist()):
+        tree.insert(Point(x, y, i))
+    return tree
+
+
+BUILDERS = {
+    "hash": lambda pos: SpatialHash.from_arrays(pos[:, 0], pos[:, 1]),
+    "flat": lambda pos: FlatQuadTree.from_arrays(pos[:, 0], pos[:, 1]),
+    "quadtree": inserted,
+}
+
+
+@pytest.mark.parametrize("radius", [20, 75])
+@pytest.mark.parametrize("build", BUILDERS.values(), ids=BUILDERS.keys())
+def test_query_pairs_matches_brute_force(build, radius):
+    pos = points()
+    first, second, d2 = build(pos).query_pairs(radius, return_distances=True)
+    assert (first < second).all()
+    found = dict(zip(zip(first.tolist(), second.tolist()), d2.tolist()))
+    assert len(found) == len(first)
+    bf, bs, bd2 = brute_pairs(pos, radius)
+    expected = dict(zip(zip(bf.tolist(), bs.tolist()), bd2.tolist()))
+    assert found.keys() == expected.keys()
+    np.testing.assert_allclose([found[pair] for pair in expected],
+                               list(expected.values()))
+
+
+def test_incomplete_index_cannot_be_made():
+    class Incomplete(SpatialIndex):
+        def query(self, boundary, found_points):
+            return found_points
+
+    with pytest.raises(TypeError, match="query_pairs"):
+        Incomplete()
@@ -0,0 +1,66 @@
+import numpy as np
+
+# One row of a species table: the parameters every actor of a species shares.
+SPECIES = np.dtype([
+    ('max_speed', np.float64),
+    ('max_acceleration', np.float64),
+    ('arrival_radius_sq', np.float64),
+    ('detection_radius', np.float64),
+    ('length', np.float64),
+    ('width', np.float64),
+    ('color', np.uint8, 3),
+])
+
+DEFAULTS = {
+    'max_speed': 200,
+    'max_acceleration': 200,
+    'arrival_radius_sq': 200**2,
+    'detection_radius': 75,
+    'length': 20,
+    'width': 20,
+    'color': (255, 255, 255),
+}
+
+
+def table(*species):
+    """A species table with a row for each dict of parameters.
+
+    Parameters a dict leaves out take their DEFAULTS value; without any
+    dicts the table holds the single default species.
+
+    """
+    rows = [dict(DEFAULTS, **params) for params in species or ({},)]
+    for params in rows:
+        unknown = set(params) - set(SPECIES.names)
+        if unknown:
+            raise ValueError("unknown species parameters: {}".format(
+                ", ".join(sorted(unknown))))
+    return np.array([tuple(params[name] for name in SPECIES.names)
+                     for params in rows], dtype=SPECIES)
+
+
+class Species:
+    """One row of a species table as plain Python numbers.
+
+    Shared by every Actor of the species, which reads its parameters from
+    here rather than from a NumPy record, whose scalar access is slow.
+
+    """
+
+    __slots__ = SPECIES.names + ('max_speed_squared',
+                                 'max_acceleration_squared')
+
+    def __init__(self, row):
+        for name in SPECIES.names:
+            value = row[name]
+            setattr(self, name, tuple(value.tolist()) if name == 'color'
+                    else float(value))
+        self.max_speed_squared = self.max_speed**2
+        self.max_acceleration_squared = self.max_acceleration**2
+
+    @classmethod
+    def rows(cls, species_table):
+        return [cls(row) for row in species_table]
+
+
+DEFAULT_TABLE = table()
@@ -0,0 +1,56 @@
+import numpy as np
+
+from timing import NULL_TIMER
+
+
+class FixedTimestep:
+    """Advance a FlockState in fixed steps at the pace of real time.
+
+    Each frame, advance() adds the real time that passed to an accumulator
+    and runs as many steps of step_ms as it holds, possibly none. At most
+    max_steps run per frame: after a stall the rest of the backlog is
+    dropped rather than caught up, which would only make the next frame
+    slower still. positions() then blends the last two states by the time
+    left in the accumulator, so motion stays smooth whether frames come
+    faster or slower than steps.
+
+    """
+
+    def __init__(self, step_ms=60, max_steps=4):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.previous = None
+
+    @property
+    def alpha(self):
+        """The fraction of a step left in the accumulator, 0 to 1."""
+        return self.accumulator / self.step_ms
+
+    def advance(self, state, elapsed_ms, timer=NULL_TIMER):
+        """Step state for elapsed_ms of real time; return the steps run."""
+        self.accumulator += elapsed_ms
+        steps = min(int(self.accumulator // self.step_ms), self.max_steps)
+        for _ in range(steps):
+            self.previous = state.positions.copy()
+            state.step(self.step_ms, timer)
+        self.accumulator -= steps * self.step_ms
+        if self.accumulator >= self.step_ms:
+            self.accumulator %= self.step_ms
+        return steps
+
+    def positions(self, state):
+        """The positions to draw: the last two states blended by alpha.
+
+        Actors that wrapped to the opposite edge during the last step are
+        drawn where they are rather than sliding across the screen.
+
+        """
+        current = state.positions
+        if self.previous is None or len(self.previous) != len(current):
+            return current
+        delta = state.displacement(current - self.previous)
+        blended = self.previous + self.alpha * delta
+        jumped = (np.abs(delta) > 0.5 * np.array(state.world)).any(axis=1)
+        blended[jumped] = current[jumped]
+        return blended
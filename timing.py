@@ -0,0 +1,87 @@
+import time
+from collections import defaultdict
+
+
+class PhaseTimer:
+    """Accumulate the wall time spent in each named phase of a frame.
+
+        with timer.phase("render"):
+            ...
+
+    totals maps each phase name to its total seconds, and frames counts the
+    calls to end_frame(). Code that would do extra work only to report a
+    counter checks enabled first.
+
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.frames = 0
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def record(self, name, start, end):
+        """Charge the phase name for the perf_counter span [start, end)."""
+        self.totals[name] += end - start
+
+    def count(self, name, value):
+        """Report the latest value of a counter; ignored here."""
+
+    def end_frame(self):
+        self.frames += 1
+
+    def per_frame_ms(self):
+        """Average milliseconds per frame spent in each phase."""
+        frames = max(self.frames, 1)
+        return {name: 1000 * total / frames
+                for name, total in self.totals.items()}
+
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, self.start, time.perf_counter())
+
+
+class NullTimer:
+    """A PhaseTimer stand-in that records nothing."""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def record(self, name, start, end):
+        pass
+
+    def count(self, name, value):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+NULL_TIMER = NullTimer()